@@ -19,8 +19,8 @@ echo.
 :: 1. Navigate to current folder
 cd /d "%~dp0"
 
-:: 2. Check for libraries (Only prints if installing)
-pip install streamlit pandas openpyxl plotly --quiet
+:: 2. Check for libraries (find_spec only looks them up, nothing is imported; pip runs when one is missing)
+python -c "import sys, importlib.util as u; sys.exit(any(u.find_spec(m) is None for m in ('streamlit', 'pandas', 'numpy', 'openpyxl', 'plotly')))" >nul 2>&1 || pip install streamlit pandas numpy openpyxl plotly --quiet
 
 :: 3. Launch App
 echo [SUCCESS] Libraries Verified.
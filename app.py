@@ -1,30 +1,57 @@
+from modules import startup
+startup.install()  # no-op unless STUDYOS_IMPORT_TIMES=1; must precede the imports it measures
+
 import streamlit as st
 import pandas as pd
 import os
 import time
 import calendar
 from datetime import datetime
-import plotly.express as px
 
 from modules.config import setup_page, get_css, SUBJECT_COL, RATING_COL, STATUS_COL
 from modules.data_engine import (
-    load_data, save_data, calculate_global_streak, 
-    generate_date_columns, get_yearly_activity
+    load_events, add_subject, save_cells, diff_cells, month_version, get_streak_report, 
+    generate_date_columns, get_yearly_activity, list_years, get_history_counts, get_year_summary, backend
 )
-from modules.renderer import render_yearly_heatmap, render_monthly_panel
+from modules.renderer import render_yearly_heatmap, render_monthly_panel, render_history_heatmap
+from modules.writer import get_writer, shutdown as shutdown_writer
+from modules.watcher import get_watcher
+from modules.errors import StudyOSError, WorkbookLockedError
+from modules import profiler
 
 # 1. SETUP
+profiler.begin_run("rerun")
 setup_page()
 st.markdown(get_css(), unsafe_allow_html=True)
+writer = get_writer()
+if st.session_state.pop("merged_edit", False): st.toast("🔀 Merged your edit with changes saved from another session.")
+
+# Live reload: the watcher thread re-imports workbooks changed outside the app;
+# this fragment only compares a counter, and reruns the page once it moves
+watcher = get_watcher() if backend().name == "excel" else None
+if watcher:
+    seen = st.session_state.get("watch_generation")
+    if seen is not None and seen != watcher.generation: st.toast(f"🔄 Reloaded {', '.join(watcher.status()['changed'])} from disk.")
+    st.session_state["watch_generation"] = watcher.generation
+
+    @st.fragment(run_every=2)
+    def live_reload():
+        if st.session_state.get("watch_generation") != watcher.generation: st.rerun(scope="app")
+    live_reload()
 
 # 2. SIDEBAR
 with st.sidebar:
     st.title("💻 StudyOS")
     st.caption("Kernel v13.0 (Modular)")
+    sync = writer.status()
+    if not backend().journaled: st.caption("💾 Saved to SQLite")
+    elif sync["state"] == "retrying": st.caption(f"⚠️ {sync['last_error']} · retry #{sync['retries']} · {sync['pending_edits']} edits queued")
+    elif sync["pending_edits"]: st.caption(f"⏳ Syncing {sync['pending_edits']} edits to Excel...")
+    else: st.caption("💾 Excel in sync")
     st.divider()
     
     current_year = datetime.now().year
-    years = list(range(2024, 2031))
+    years = sorted(set(range(2024, 2031)) | set(list_years()))
     sel_year = st.selectbox("Year", years, index=years.index(current_year) if current_year in years else 0)
     
     current_month_index = datetime.now().month - 1
@@ -37,21 +64,18 @@ with st.sidebar:
         if st.button("➕ Add", width="stretch"):
             if new_subj:
                 try:
-                    df_curr = load_data(sel_year, sel_month)
-                    if new_subj not in df_curr[SUBJECT_COL].values:
-                        new_row = {SUBJECT_COL: new_subj, RATING_COL: 0, STATUS_COL: "Active"}
-                        for col in df_curr.columns:
-                            if col not in new_row: new_row[col] = False
-                        df_curr = pd.concat([df_curr, pd.DataFrame([new_row])], ignore_index=True)
-                        save_data(df_curr, sel_year, sel_month)
+                    if add_subject(sel_year, sel_month, new_subj):
+                        if backend().journaled: writer.submit(sel_year, sel_month)
                         st.rerun()
-                except Exception as e: st.error(e)
+                except StudyOSError as e: st.error(f"⚠️ {e}")
 
         if st.button("🗑️ Delete", width="stretch"):
             st.warning("Delete using checkboxes in table.")
     st.divider()
+    if profiler.ENABLED or startup.ENABLED: diagnostics = st.expander("⏱️ Diagnostics", expanded=False)
     if st.button("🔴 Shut Down", width="stretch"):
         st.warning("Halting...")
+        if not shutdown_writer(): st.error("⚠️ Some edits are still journaled; they will sync on next launch.")
         time.sleep(0.5)
         os._exit(0)
 
@@ -60,34 +84,56 @@ c_title, c_streak = st.columns([3, 1])
 with c_title: st.title(f"📅 {sel_month} {sel_year}")
 
 try:
-    df = load_data(sel_year, sel_month)
-except:
+    version = month_version(sel_year, sel_month)  # read first: a save landing in between shows up as stale
+    events = load_events(sel_year, sel_month)
+except WorkbookLockedError:
     st.error(f"Please close **studyProgress{sel_year}.xlsx**.")
     st.stop()
+except StudyOSError as e:
+    st.error(f"⚠️ Data Init Error: {e}")
+    st.stop()
 
 # Prep
 month_idx = list(calendar.month_name).index(sel_month)
 today = datetime.now()
 is_current = (sel_year == today.year) and (month_idx == today.month)
 expected_date_cols = generate_date_columns(sel_year, sel_month)
-valid_date_cols = [c for c in expected_date_cols if c in df.columns]
 
 # Streak
-global_streak = calculate_global_streak(df, valid_date_cols)
-with c_streak: st.metric(label="Streak", value=f"🔥 {global_streak} Days")
-
-# Smart Focus Toggle
+# Reads every year's workbook: one that is locked or corrupt shouldn't take the month page down with it
+try: streak_report = get_streak_report()
+except StudyOSError as e:
+    streak_report = None
+    st.warning(f"⚠️ Streak unavailable: {e}")
+with c_streak: st.metric(label="Streak", value=f"🔥 {streak_report.current if streak_report else '–'} Days")
+
+# Smart Focus Window: the editor pages through the month N days at a time
 show_history = st.toggle("📜 Show Full History", value=False)
 
-if is_current and not show_history:
-    today_str = f"Date {today.year}-{today.month:02d}-{today.day:02d}"
-    if today_str in expected_date_cols:
-        idx = expected_date_cols.index(today_str)
-        start_idx = max(0, idx - 3) 
-        visible_date_cols = expected_date_cols[start_idx:]
-    else: visible_date_cols = expected_date_cols 
+if not show_history:
+    c_size, c_prev, c_range, c_next = st.columns([2, 1, 3, 1], vertical_alignment="center")
+    with c_size: window_days = st.selectbox("Window", [7, 14], format_func=lambda n: f"{n} days", label_visibility="collapsed")
+    window_days = min(window_days, len(expected_date_cols))
+    last_start = len(expected_date_cols) - window_days
+    window_key = f"window_{sel_year}_{sel_month}_{window_days}"
+    if window_key not in st.session_state:
+        today_str = f"Date {today.year}-{today.month:02d}-{today.day:02d}"
+        # Opens on the 3 days before today in the current month, on day 1 otherwise
+        focus = expected_date_cols.index(today_str) - 3 if is_current and today_str in expected_date_cols else 0
+        st.session_state[window_key] = min(max(0, focus), last_start)
+    with c_prev:
+        if st.button("◀", width="stretch", disabled=st.session_state[window_key] == 0):
+            st.session_state[window_key] = max(0, st.session_state[window_key] - window_days)
+    with c_next:
+        if st.button("▶", width="stretch", disabled=st.session_state[window_key] == last_start):
+            st.session_state[window_key] = min(last_start, st.session_state[window_key] + window_days)
+    start_idx = st.session_state[window_key]
+    visible_date_cols = expected_date_cols[start_idx:start_idx + window_days]
+    with c_range: st.caption(f"{sel_month} {int(visible_date_cols[0][-2:])}–{int(visible_date_cols[-1][-2:])}")
 else: visible_date_cols = expected_date_cols
 
+df = events.to_frame(visible_date_cols)  # wide layout for the editor, built for the visible days only
+
 # 4. SPLIT LAYOUT
 col_main, col_right = st.columns([4, 1])
 
@@ -103,73 +149,86 @@ with col_main:
         label = f"⭐ {day_num}" if (is_current and day_num == today.day) else f"{day_num}"
         column_config[col_name] = st.column_config.CheckboxColumn(label, width="small", default=False)
 
-    for col in expected_date_cols:
-        if col not in df.columns: df[col] = False
-
     display_cols = [SUBJECT_COL, RATING_COL, STATUS_COL] + visible_date_cols
     safe_cols = [c for c in display_cols if c in df.columns]
 
-    edited_df = st.data_editor(
-        df[safe_cols],
-        column_config=column_config,
-        width="stretch",
-        hide_index=True,
-        height=350,
-        num_rows="fixed"
-    )
-
-    if not df[safe_cols].equals(edited_df):
-        df.update(edited_df)
-        try:
-            save_data(df, sel_year, sel_month)
-            st.rerun()
-        except: st.error("⚠️ Close the Excel file to save changes!")
+    with profiler.span("app.data_editor"):
+        edited_df = st.data_editor(
+            df[safe_cols],
+            column_config=column_config,
+            width="stretch",
+            hide_index=True,
+            height=350,
+            num_rows="fixed"
+        )
+
+    with profiler.span("app.editor_compare"):
+        changed = not df[safe_cols].equals(edited_df)
+    if changed:
+        changes = diff_cells(df[safe_cols], edited_df)
+        if changes:
+            try:
+                if save_cells(sel_year, sel_month, changes, base_version=version): st.session_state["merged_edit"] = True
+                if backend().journaled: writer.submit(sel_year, sel_month, len(changes))
+                st.rerun()
+            except WorkbookLockedError: st.error("⚠️ Close the Excel file to save changes!")
+            except StudyOSError as e: st.error(f"Save Error: {e}")
         
 with col_right:
     if not edited_df.empty:
-        html_month = render_monthly_panel(df, sel_year, sel_month)
+        html_month = render_monthly_panel(events, sel_year, sel_month)
         st.markdown(html_month, unsafe_allow_html=True)
     else:
         st.info("No data.")
 
 # 5. DROPDOWN ANALYTICS
 st.divider()
-view_option = st.selectbox("📊 Additional Analytics:", ["🌍 Yearly Consistency", "🔥 Streaks", "📈 Total Study Volume"], index=0)
+view_option = st.selectbox("📊 Additional Analytics:", ["🌍 Yearly Consistency", "🗓️ Multi-Year History", "🔥 Streaks", "📈 Total Study Volume"], index=0)
 st.write("") 
 
 if not df.empty:
-    numeric_data = df[valid_date_cols].replace({'True': True, 'False': False}).fillna(False).astype(int)
-
-    if view_option == "🌍 Yearly Consistency":
-        yearly_series = get_yearly_activity(sel_year)
-        if not yearly_series.empty:
-            html_year = render_yearly_heatmap(yearly_series)
-            st.markdown(html_year, unsafe_allow_html=True)
-        else: st.warning("No data recorded for this year yet.")
+    try:
+        if view_option == "🌍 Yearly Consistency":
+            yearly_series = get_yearly_activity(sel_year)
+            if not yearly_series.empty:
+                html_year = render_yearly_heatmap(yearly_series)
+                st.markdown(html_year, unsafe_allow_html=True)
+            else: st.warning("No data recorded for this year yet.")
+
+        elif view_option == "🗓️ Multi-Year History":
+            tracked_years = list_years()
+            if len(tracked_years) > 1:
+                first, last = st.select_slider("Years", options=tracked_years, value=(tracked_years[0], tracked_years[-1]))
+            else: first = last = sel_year
+            history = get_history_counts(f"{first}-01-01", f"{last}-12-31")
+            st.markdown(render_history_heatmap(history), unsafe_allow_html=True)
             
-    elif view_option == "🔥 Streaks":
-        counts = numeric_data.sum(axis=1)
-        res = pd.DataFrame({SUBJECT_COL: df[SUBJECT_COL], "Total Days": counts})
-        res["Status"] = res["Total Days"].apply(lambda x: "🔥🔥🔥" if x>10 else ("🔥" if x>3 else "❄️"))
-        st.dataframe(res, width="stretch", hide_index=True)
-        
-    elif view_option == "📈 Total Study Volume":
-        counts = numeric_data.sum(axis=1)
-        plot_df = pd.DataFrame({SUBJECT_COL: df[SUBJECT_COL], "Days": counts}).sort_values("Days", ascending=True)
-        fig_bar = px.bar(plot_df, x="Days", y=SUBJECT_COL, orientation='h', text="Days", color="Days", color_continuous_scale=["#0e4429", "#39d353"])
-        
-        fig_bar.update_layout(
-            plot_bgcolor='#0d1117', 
-            paper_bgcolor='#0d1117', 
-            font_color='#e6edf3', 
-            margin=dict(t=0, l=0, r=0, b=0), 
-            height=300,
-            xaxis=dict(showgrid=False, fixedrange=True),
-            yaxis=dict(showgrid=False, fixedrange=True),
-            dragmode=False 
-        )
-        fig_bar.update_coloraxes(showscale=False)
+        elif view_option == "🔥 Streaks":
+            from modules.analytics import streaks_table
+            if streak_report is None: st.warning("Streaks are unavailable until every workbook can be read.")
+            else: st.dataframe(streaks_table(get_year_summary(sel_year), sel_month, events.subjects, streak_report, today.date()), width="stretch", hide_index=True)
         
-        st.plotly_chart(fig_bar, use_container_width=True, config={'displayModeBar': False})
+        elif view_option == "📈 Total Study Volume":
+            from modules.analytics import volume_chart
+            st.plotly_chart(volume_chart(get_year_summary(sel_year), sel_month, events.subjects), use_container_width=True, config={'displayModeBar': False})
+    except WorkbookLockedError as e: st.error(f"⚠️ {e}. Close it to see this view.")
+    except StudyOSError as e: st.error(f"⚠️ Data Init Error: {e}")
 else:
-    st.info("No data available.")
\ No newline at end of file
+    st.info("No data available.")
+
+# 6. DIAGNOSTICS
+run = profiler.end_run()
+if run:
+    with diagnostics:
+        st.caption(f"Last rerun: {run['total_ms']:.1f} ms · log: {profiler.LOG_PATH}")
+        spans = pd.DataFrame(run["spans"])
+        if not spans.empty:
+            spans["name"] = spans["depth"].map(lambda d: "· " * d) + spans["name"]
+            st.dataframe(spans[["name", "ms"]], width="stretch", hide_index=True)
+        if run["counters"]: st.json(run["counters"])
+if startup.ENABLED:
+    with diagnostics:
+        imports = pd.DataFrame(startup.report(25))
+        if not imports.empty:
+            st.caption(f"Slowest imports by self time ({len(startup.report())} modules timed)")
+            st.dataframe(imports, width="stretch", hide_index=True)
\ No newline at end of file
@@ -0,0 +1,160 @@
+import argparse
+import calendar
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.config import SUBJECT_COL, RATING_COL, STATUS_COL, CACHE_DIR
+from modules import data_engine, renderer
+
+# --- SYNTHETIC WORKBOOKS ---
+# Same layout as the app writes, with the messy cell mix real files end up with:
+# real booleans, 'True'/'False' strings and blanks (NaN).
+MESSY_VALUES = np.array([True, False, "True", "False", None], dtype=object)
+MESSY_WEIGHTS = [0.25, 0.40, 0.10, 0.10, 0.15]
+
+def make_month(rng, year, month_name, subjects):
+    date_cols = data_engine.generate_date_columns(year, month_name)
+    cells = rng.choice(MESSY_VALUES, size=(subjects, len(date_cols)), p=MESSY_WEIGHTS)
+    df = pd.DataFrame(cells, columns=date_cols)
+    df.insert(0, SUBJECT_COL, [f"Subject {i:03d}" for i in range(subjects)])
+    df.insert(1, RATING_COL, rng.integers(0, 6, subjects))
+    df.insert(2, STATUS_COL, rng.choice(["Active", "Completed", "On Hold", "Dropped"], subjects))
+    return df
+
+def generate_workbooks(directory, years, months, subjects, seed):
+    rng = np.random.default_rng(seed)
+    last = date.today().year
+    for year in range(last - years + 1, last + 1):
+        path = os.path.join(directory, data_engine.get_file_path(year))
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for month_name in calendar.month_name[1:months + 1]:
+                make_month(rng, year, month_name, subjects).to_excel(writer, sheet_name=month_name, index=False)
+    return list(range(last - years + 1, last + 1))
+
+# --- TIMING ---
+def reset(cold=False):
+    data_engine.clear_caches()
+    renderer.clear_cache()
+    if cold: shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+def measure(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+def run_suite(years, repeat):
+    year = years[-1]
+    month_name = calendar.month_name[1]
+    results = {}
+    cold = lambda: reset(cold=True)
+    warm = lambda: reset(cold=False)
+
+    results["load_data.cold"] = measure(lambda: data_engine.load_data(year, month_name), repeat, cold)
+    results["load_data.sidecar"] = measure(lambda: data_engine.load_data(year, month_name), repeat, warm)
+    results["load_data.cached"] = measure(lambda: data_engine.load_data(year, month_name), repeat)
+
+    results["get_yearly_activity.cold"] = measure(lambda: data_engine.get_yearly_activity(year), repeat, cold)
+    results["get_yearly_activity.index"] = measure(lambda: data_engine.get_yearly_activity(year), repeat, warm)
+    results["get_yearly_activity.cached"] = measure(lambda: data_engine.get_yearly_activity(year), repeat)
+
+    start, end = f"{years[0]}-01-01", f"{years[-1]}-12-31"
+    results["get_history_counts.cold"] = measure(lambda: data_engine.get_history_counts(start, end), max(1, repeat // 2), cold)
+    results["get_history_counts.cached"] = measure(lambda: data_engine.get_history_counts(start, end), repeat)
+
+    results["get_year_summary.rebuild"] = measure(lambda: data_engine.get_year_summary(year), repeat, warm)
+    results["get_year_summary.cached"] = measure(lambda: data_engine.get_year_summary(year), repeat)
+
+    results["calculate_global_streak.rebuild"] = measure(data_engine.calculate_global_streak, repeat, warm)
+    results["calculate_global_streak.cached"] = measure(data_engine.calculate_global_streak, repeat)
+
+    series = data_engine.get_yearly_activity(year)
+    results["render_yearly_heatmap.cold"] = measure(lambda: renderer.render_yearly_heatmap(series), repeat, renderer.clear_cache)
+    results["render_yearly_heatmap.memo"] = measure(lambda: renderer.render_yearly_heatmap(series), repeat)
+
+    grid = data_engine.load_grid(year, month_name)
+    results["render_monthly_panel.cold"] = measure(lambda: renderer.render_monthly_panel(grid, year, month_name), repeat, renderer.clear_cache)
+    results["render_monthly_panel.memo"] = measure(lambda: renderer.render_monthly_panel(grid, year, month_name), repeat)
+
+    df = data_engine.load_data(year, month_name)
+    date_col = data_engine.generate_date_columns(year, month_name)[0]
+    subject = df[SUBJECT_COL].iat[0]
+    flip = iter(range(10 ** 9))
+    results["save_cells"] = measure(lambda: data_engine.save_cells(year, month_name, [(subject, date_col, next(flip) % 2 == 0)]), repeat)
+    if data_engine.backend().journaled: results["compact_journal"] = measure(lambda: data_engine.compact_journal(year), 1)
+    results["save_data"] = measure(lambda: data_engine.save_data(data_engine.load_data(year, month_name), year, month_name), repeat)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time StudyOS data and render paths on synthetic workbooks.")
+    parser.add_argument("--years", type=int, default=3, help="workbooks to generate, ending with the current year")
+    parser.add_argument("--months", type=int, default=12, help="month sheets per workbook (1-12)")
+    parser.add_argument("--subjects", type=int, default=12, help="subject rows per month sheet")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per entry point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=sorted(data_engine.BACKENDS), default="excel", help="storage backend to time (sqlite imports the generated workbooks first)")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory with the generated files")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="studyos-bench-")
+    cwd = os.getcwd()
+    out = os.path.abspath(args.out) if args.out else None
+    try:
+        os.chdir(workdir)  # the engine resolves studyProgress{year}.xlsx relative to the CWD
+        start = time.perf_counter()
+        years = generate_workbooks(workdir, args.years, min(max(args.months, 1), 12), args.subjects, args.seed)
+        generate_s = time.perf_counter() - start
+        imported = None
+        if args.backend != "excel":
+            imported = measure(lambda: data_engine.transfer("excel", args.backend), 1)
+            data_engine.set_backend(args.backend)
+        results = run_suite(years, args.repeat)
+        if imported: results[f"transfer.excel_to_{args.backend}"] = imported
+    finally:
+        os.chdir(cwd)
+        if not args.keep: shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "scale": {"years": args.years, "months": args.months, "subjects": args.subjects},
+            "repeat": args.repeat,
+            "backend": args.backend,
+            "generate_s": round(generate_s, 3),
+            "workdir": workdir if args.keep else None,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f: f.write(text + "\n")
+    else: print(text)
+
+if __name__ == "__main__":
+    main()
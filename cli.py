@@ -0,0 +1,94 @@
+import argparse
+import csv
+import json
+import sys
+from datetime import date
+
+from modules import data_engine
+
+# --- STUDYOS COMMAND LINE ---
+# Bulk import/export of study logs as (subject, date[, done]) events:
+#   python cli.py import log.csv            CSV with subject,date[,done] columns
+#   python cli.py import log.jsonl          one {"subject", "date", "done"} object per line
+#   python cli.py export history.csv        every year, oldest first ('-' for stdout)
+# Files are read and written as streams; imports land in batches, each batch
+# writing a year's storage once. --backend picks the storage like STUDYOS_BACKEND.
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "done"}
+
+def _format(path, given):
+    if given: return given
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+def _open(path, mode):
+    if path == "-": return open((sys.stdin if "r" in mode else sys.stdout).fileno(), mode, encoding="utf-8", newline="", closefd=False)
+    return open(path, mode, encoding="utf-8", newline="")
+
+def _done(value):
+    if value is None or value == "": return True  # a logged event means the day was studied
+    if isinstance(value, bool): return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+def _rows(f, fmt):
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        if line.strip(): yield json.loads(line)
+
+def read_events(f, fmt, skipped):
+    # Bad rows are counted in `skipped` (line number, reason) instead of aborting a long import
+    for n, row in enumerate(_rows(f, fmt), start=1):
+        try:
+            subject = str(row.get("subject") or "").strip()
+            if not subject: raise ValueError("missing subject")
+            day = date.fromisoformat(str(row.get("date") or "")[:10])
+            yield subject, day, _done(row.get("done"))
+        except (ValueError, AttributeError) as e:
+            skipped.append((n, str(e)))
+
+def write_events(f, fmt, events):
+    written = 0
+    writer = csv.writer(f) if fmt == "csv" else None
+    if writer: writer.writerow(["subject", "date"])
+    for subject, day in events:
+        if writer: writer.writerow([subject, day])
+        else: f.write(json.dumps({"subject": subject, "date": day}) + "\n")
+        written += 1
+    return written
+
+def cmd_import(args):
+    skipped = []
+    with _open(args.path, "r") as f:
+        count = data_engine.import_events(read_events(f, _format(args.path, args.format), skipped), batch_size=args.batch_size)
+    print(f"Imported {count} events into {data_engine.backend().name}", file=sys.stderr)
+    for n, reason in skipped[:10]: print(f"  skipped row {n}: {reason}", file=sys.stderr)
+    if len(skipped) > 10: print(f"  ... {len(skipped) - 10} more skipped", file=sys.stderr)
+    return 1 if skipped and not count else 0
+
+def cmd_export(args):
+    with _open(args.path, "w") as f:
+        count = write_events(f, _format(args.path, args.format), data_engine.export_events(args.years))
+    print(f"Exported {count} events from {data_engine.backend().name}", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import and export StudyOS history as CSV or JSON-lines event logs.")
+    parser.add_argument("--backend", choices=sorted(data_engine.BACKENDS), help="storage to read/write (default: STUDYOS_BACKEND or excel)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imp = commands.add_parser("import", help="stream an event log into storage")
+    imp.add_argument("path", help="CSV or JSON-lines file, '-' for stdin")
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    imp.add_argument("--batch-size", type=int, default=data_engine.IMPORT_BATCH_SIZE, help="events per batch (one storage write per year per batch)")
+    imp.set_defaults(run=cmd_import)
+    exp = commands.add_parser("export", help="stream every done (subject, day) out of storage")
+    exp.add_argument("path", help="output file, '-' for stdout")
+    exp.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    exp.add_argument("--years", type=int, nargs="+", help="only these years")
+    exp.set_defaults(run=cmd_export)
+    args = parser.parse_args(argv)
+    if args.backend: data_engine.set_backend(args.backend)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
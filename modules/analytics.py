@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import pandas as pd
+from .config import SUBJECT_COL
+from . import profiler
+
+# --- ANALYTICS VIEWS ---
+# Imported only once a view needs it, so plotly stays out of the startup path.
+# Tables and figures are built from the precomputed YearSummary and memoized
+# per (view, year, month, data version), so flipping between views or
+# rerunning never touches raw cells.
+
+VIEW_CACHE_SIZE = 16
+_views = OrderedDict()
+
+def _memoized(key, build):
+    if key in _views:
+        _views.move_to_end(key)
+        profiler.count("analytics.memo_hit")
+        return _views[key]
+    value = _views[key] = build()
+    while len(_views) > VIEW_CACHE_SIZE: _views.popitem(last=False)
+    return value
+
+def _streaks_table(summary, month_name, subjects, report, today):
+    res = pd.DataFrame({SUBJECT_COL: subjects, "Total Days": summary.month_totals(subjects, month_name)})
+    res[f"{summary.year} Total"] = [int(summary.totals[r]) if r >= 0 else 0 for r in summary.rows(subjects)]
+    res["7-Day %"] = (summary.rate(subjects, today, 7) * 100).round().astype(int)
+    res["30-Day %"] = (summary.rate(subjects, today, 30) * 100).round().astype(int)
+    res["Current Streak"] = res[SUBJECT_COL].map(lambda s: report.subjects.get(s, (0, 0))[0])
+    res["Longest Streak"] = res[SUBJECT_COL].map(lambda s: report.subjects.get(s, (0, 0))[1])
+    res[f"Longest in {summary.year}"] = summary.year_longest(subjects)
+    res["Status"] = res["Total Days"].apply(lambda x: "🔥🔥🔥" if x>10 else ("🔥" if x>3 else "❄️"))
+    return res
+
+def streaks_table(summary, month_name, subjects, report, today):
+    subjects = list(subjects)
+    key = ("streaks", summary.year, month_name, summary.key, tuple(subjects), today, report.current, tuple(report.subjects.items()))
+    return _memoized(key, lambda: _streaks_table(summary, month_name, subjects, report, today))
+
+def _volume_chart(summary, month_name, subjects):
+    import plotly.express as px
+    plot_df = pd.DataFrame({SUBJECT_COL: subjects, "Days": summary.month_totals(subjects, month_name)}).sort_values("Days", ascending=True)
+    fig_bar = px.bar(plot_df, x="Days", y=SUBJECT_COL, orientation='h', text="Days", color="Days", color_continuous_scale=["#0e4429", "#39d353"])
+    
+    fig_bar.update_layout(
+        plot_bgcolor='#0d1117', 
+        paper_bgcolor='#0d1117', 
+        font_color='#e6edf3', 
+        margin=dict(t=0, l=0, r=0, b=0), 
+        height=300,
+        xaxis=dict(showgrid=False, fixedrange=True),
+        yaxis=dict(showgrid=False, fixedrange=True),
+        dragmode=False 
+    )
+    fig_bar.update_coloraxes(showscale=False)
+    return fig_bar
+
+def volume_chart(summary, month_name, subjects):
+    subjects = list(subjects)
+    key = ("volume", summary.year, month_name, summary.key, tuple(subjects))
+    return _memoized(key, lambda: _volume_chart(summary, month_name, subjects))
\ No newline at end of file
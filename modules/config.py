@@ -1,10 +1,16 @@
-import streamlit as st
+import os
 
 SUBJECT_COL = "Subject/Skill"
 RATING_COL = "Excellence Rating"
 STATUS_COL = "Status"
+CACHE_DIR = ".studyos"
+
+# Storage backend: "excel" (studyProgress{year}.xlsx workbooks) or "sqlite"
+BACKEND = os.environ.get("STUDYOS_BACKEND", "excel").lower()
+DB_PATH = os.environ.get("STUDYOS_DB", "studyos.db")
 
 def setup_page():
+    import streamlit as st  # only the UI needs it: the engine modules import config headless
     st.set_page_config(page_title="StudyOS v13.0", page_icon="🔥", layout="wide")
 
 def get_css():
@@ -1,126 +1,843 @@
 import pandas as pd
+import numpy as np
 import os
 import time
 import calendar
-from datetime import datetime
-import streamlit as st
-from .config import SUBJECT_COL, RATING_COL, STATUS_COL
+import glob
+import re
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import lru_cache
+from datetime import date
+from .config import SUBJECT_COL, RATING_COL, STATUS_COL, BACKEND, DB_PATH
+from . import sidecar, sqlite_store, profiler
+from .errors import DataInitError, SaveError, WorkbookLockedError
+from .filelock import file_lock
+from .grid import MonthGrid
+from .events import MonthEvents
+from .streaks import StreakIndex
+from .history import HistoryIndex
+from .summary import YearSummary
+
+_workbook_locks = {}
+_held = threading.local()
+
+@contextmanager
+def workbook_lock(year):
+    # Serializes writers of one workbook: an RLock between this process's threads
+    # (sessions, write-behind thread) plus an advisory file lock between processes,
+    # taken once by the outermost holder so nested writes don't deadlock
+    with sidecar.lock:
+        thread_lock = _workbook_locks.setdefault(year, threading.RLock())
+    with thread_lock:
+        held = _held.__dict__.setdefault("years", {})
+        with ExitStack() as stack:
+            if not held.get(year):
+                try: stack.enter_context(file_lock(sidecar.lock_path(year)))
+                except TimeoutError as e: raise WorkbookLockedError(f"Another StudyOS process is still writing {year}: {e}") from e
+            held[year] = held.get(year, 0) + 1
+            try: yield
+            finally: held[year] -= 1
+
+# --- IN-MEMORY CACHE ---
+# Bounded LRU of loaded frames/grids/activity keyed by (kind, year, month). An
+# entry is served only while the backend's stamp for the year (workbook stat
+# stamp, or the SQLite revision) matches the one it was loaded under;
+# in-process saves evict exactly the keys they touch.
+CACHE_SIZE = 32
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_generations = {}
+
+def _cached(key, loader):
+    year = key[1]
+    store = backend()
+    stamp = store.stamp(year)
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            _cache.move_to_end(key)
+            profiler.count("cache.hit")
+            return hit[1]
+        generation = _generations.get(year, 0)
+    profiler.count("cache.miss")
+    value = loader()
+    with _cache_lock:
+        # A save that landed while we were loading makes this value stale
+        if _generations.get(year, 0) == generation:
+            _cache[key] = (store.stamp(year), value)
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_SIZE: _cache.popitem(last=False)
+    return value
+
+def invalidate(year, month_name=None):
+    with _cache_lock:
+        _generations[year] = _generations.get(year, 0) + 1
+        for key in list(_cache):
+            if key[1] == year and (month_name is None or key[2] in (month_name, None)): del _cache[key]
+
+def clear_caches():
+    with _cache_lock:
+        _cache.clear()
+        for year in list(_generations): _generations[year] += 1
+    _year_matrices.clear()
+    _history.clear()
+    _streak_index.clear()
+    _summaries.clear()
+
+def _restamp(year, old_stamp, new_stamp):
+    # Our own write changed the year's stamp without changing untouched months
+    with _cache_lock:
+        for key, (stamp, value) in _cache.items():
+            if key[1] == year and stamp == old_stamp: _cache[key] = (new_stamp, value)
+    summary = _summaries.get(year)
+    if summary is not None and summary.key == old_stamp: summary.key = new_stamp
+
+def _read_excel(filename, sheet_name=None):
+    # Like ensure_file_and_sheet_exist: a locked, corrupt or half-synced workbook surfaces as an engine error
+    try: sheets = pd.read_excel(filename, sheet_name=sheet_name)
+    except PermissionError as e: raise WorkbookLockedError(f"{filename} is open in another program") from e
+    except Exception as e: raise DataInitError(f"Could not read {filename}: {e}") from e
+    _count_excel_read(filename)
+    return sheets
+
+def _count_excel_read(filename):
+    if profiler.ENABLED:
+        profiler.count("excel.opens")
+        profiler.count("excel.bytes_read", os.path.getsize(filename))
 
 def get_file_path(year):
     return f"studyProgress{year}.xlsx"
 
+def _workbook_years():
+    years = []
+    for path in glob.glob("studyProgress*.xlsx"):
+        match = re.fullmatch(r"studyProgress(\d{4})\.xlsx", os.path.basename(path))
+        if match: years.append(int(match.group(1)))
+    return sorted(years)
+
+def list_years():
+    return backend().years()
+
 def get_month_days(year, month_name):
     month_index = list(calendar.month_name).index(month_name)
     _, num_days = calendar.monthrange(year, month_index)
     return num_days
 
-def generate_date_columns(year, month_name):
+@lru_cache(maxsize=None)
+def _date_columns(year, month_name):
     month_index = list(calendar.month_name).index(month_name)
     num_days = get_month_days(year, month_name)
-    return [f"Date {year}-{month_index:02d}-{day:02d}" for day in range(1, num_days + 1)]
+    return tuple(f"Date {year}-{month_index:02d}-{day:02d}" for day in range(1, num_days + 1))
+
+def generate_date_columns(year, month_name):
+    return list(_date_columns(year, month_name))
+
+def default_month_frame(year, month_name):
+    cols = [SUBJECT_COL, RATING_COL, STATUS_COL] + generate_date_columns(year, month_name)
+    # --- PLACEMENT DEFAULT SKILLS ---
+    defaults = [
+        ("DSA (LeetCode)", 0, "Active"), 
+        ("React / Dev", 0, "Active"),
+        ("Aptitude", 0, "Active"),
+        ("CS Fundamentals", 0, "On Hold")
+    ]
+    data = []
+    for subj, rate, stat in defaults:
+        row = {SUBJECT_COL: subj, RATING_COL: rate, STATUS_COL: stat}
+        for d_col in cols[3:]: row[d_col] = False
+        data.append(row)
+    return pd.DataFrame(data, columns=cols)
 
+def _replace_sheets(filename, frames):
+    # Written into a temp copy and swapped in with os.replace, so readers see the old or the new workbook, never half of one
+    tmp = filename[:-len(".xlsx")] + ".tmp.xlsx"  # pandas picks the writer by extension
+    append = os.path.exists(filename)
+    try:
+        if append: shutil.copyfile(filename, tmp)
+        options = {"mode": "a", "if_sheet_exists": "replace"} if append else {}
+        with pd.ExcelWriter(tmp, engine='openpyxl', **options) as writer:
+            for sheet, df in frames.items(): df.to_excel(writer, sheet_name=sheet, index=False)
+        os.replace(tmp, filename)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+
+@profiler.timed()
 def ensure_file_and_sheet_exist(year, month_name):
     filename = get_file_path(year)
-    if not os.path.exists(filename):
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            pd.DataFrame().to_excel(writer, sheet_name=month_name)
-    try:
-        xls = pd.ExcelFile(filename)
-        if month_name not in xls.sheet_names:
-            cols = [SUBJECT_COL, RATING_COL, STATUS_COL] + generate_date_columns(year, month_name)
-            # --- PLACEMENT DEFAULT SKILLS ---
-            defaults = [
-                ("DSA (LeetCode)", 0, "Active"), 
-                ("React / Dev", 0, "Active"),
-                ("Aptitude", 0, "Active"),
-                ("CS Fundamentals", 0, "On Hold")
-            ]
-            data = []
-            for subj, rate, stat in defaults:
-                row = {SUBJECT_COL: subj, RATING_COL: rate, STATUS_COL: stat}
-                for d_col in cols[3:]: row[d_col] = False
-                data.append(row)
-            df = pd.DataFrame(data)
-            with pd.ExcelWriter(filename, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                df.to_excel(writer, sheet_name=month_name, index=False)
-    except Exception as e:
-        st.error(f"⚠️ Data Init Error: {e}")
-        st.stop()
+    with workbook_lock(year):
+        if not os.path.exists(filename):
+            _replace_sheets(filename, {month_name: default_month_frame(year, month_name)})
+            return
+        try:
+            xls = pd.ExcelFile(filename)
+            profiler.count("excel.opens")
+            if month_name not in xls.sheet_names:
+                _replace_sheets(filename, {month_name: default_month_frame(year, month_name)})
+        except PermissionError as e: raise WorkbookLockedError(f"{filename} is open in another program") from e
+        except Exception as e: raise DataInitError(f"Could not open {month_name} in {filename}: {e}") from e
 
+@profiler.timed()
 def load_data(year, month_name):
-    ensure_file_and_sheet_exist(year, month_name)
-    filename = get_file_path(year)
-    df = pd.read_excel(filename, sheet_name=month_name)
+    # Callers edit the frame in place, so hand out copies of the cached one
+    return _cached(("frame", year, month_name), lambda: backend().load_month(year, month_name)).copy()
+
+@profiler.timed()
+def load_events(year, month_name):
+    return _cached(("events", year, month_name), lambda: backend().load_events(year, month_name))
+
+@profiler.timed()
+def add_subject(year, month_name, subject, rating=0, status="Active"):
+    return backend().add_subject(year, month_name, subject, rating, status)
+
+def _add_row(year, month_name, subject, rating, status):
+    with workbook_lock(year):
+        if subject in load_events(year, month_name): return False
+        # Journaled like save_cells: the subject cell creates the row (see apply_changes),
+        # and the workbook only gets it when compact_journal runs
+        _save_journaled(year, month_name, [(subject, SUBJECT_COL, subject), (subject, RATING_COL, rating), (subject, STATUS_COL, status)], None)
+        return True
+
+def _with_status(df):
     if STATUS_COL not in df.columns:
         loc_index = 2 if len(df.columns) >= 2 else 1
         df.insert(loc_index, STATUS_COL, "Active")
     return df
 
-def save_data(df, year, month_name):
+def _load_frame(year, month_name):
     filename = get_file_path(year)
+    # Fast path: binary sidecar, valid while the workbook stamp is unchanged
+    if sidecar.is_synced(year, filename):
+        df = sidecar.read_month(year, month_name)
+        if df is not None: return df
+    # Read -> pending journal -> sidecar -> mark_synced as one unit: a save_cells landing
+    # in between would be missing from a sidecar that mark_synced then vouches for
+    with workbook_lock(year):
+        if sidecar.validate(year, filename):
+            df = sidecar.read_month(year, month_name)  # imported by whoever held the lock before us
+            if df is not None: return df
+        old_stamp = sidecar.data_stamp(year, filename)
+        ensure_file_and_sheet_exist(year, month_name)
+        _restamp(year, old_stamp, sidecar.data_stamp(year, filename))
+        df = _with_status(_read_excel(filename, month_name))
+        apply_changes(df, sidecar.pending_changes(year, month_name))
+        imported = sidecar.write_month(year, month_name, df)
+        sidecar.mark_synced(year, filename)
+        return df if imported is None else imported
+
+@profiler.timed()
+def save_data(df, year, month_name):
     if STATUS_COL in df.columns: df[STATUS_COL] = df[STATUS_COL].fillna("Active")
     if RATING_COL in df.columns: df[RATING_COL] = df[RATING_COL].fillna(0)
-    df = df.fillna(False)
-    
+    return backend().save_month(df.fillna(False), year, month_name)
+
+def _save_sheet(df, year, month_name):
+    filename = get_file_path(year)
     success = False
-    for attempt in range(5):
-        try:
-            with pd.ExcelWriter(filename, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-                df.to_excel(writer, sheet_name=month_name, index=False)
-            success = True
-            break 
-        except PermissionError:
-            time.sleep(0.5)
-        except Exception as e:
-            st.error(f"Save Error: {e}")
-            return
-    if not success:
-        st.error("⚠️ Save Failed! Excel file is locked.")
+    with workbook_lock(year):
+        old_stamp = sidecar.data_stamp(year, filename)
+        for attempt in range(5):
+            profiler.count("save_data.attempts")
+            try:
+                _replace_sheets(filename, {month_name: df})
+                success = True
+                break 
+            except PermissionError:
+                profiler.count("save_data.retries")
+                time.sleep(0.5)
+            except Exception as e: raise SaveError(f"Could not save {month_name} to {filename}: {e}") from e
+        if not success: raise WorkbookLockedError(f"{filename} is open in another program")
+        # The full sheet write supersedes any journaled cells of this month
+        sidecar.truncate_journal(year, month_name=month_name)
+        sidecar.write_month(year, month_name, df)
+        grid = to_grid(df)
+        sidecar.update_activity(year, grid)
+        sidecar.mark_synced(year, filename)
+        sidecar.bump_month(year, month_name)
+        _patch_summary(year, month_name, old_stamp, lambda: grid)
+        _restamp(year, old_stamp, sidecar.data_stamp(year, filename))
+        invalidate(year, month_name)
 
-def get_yearly_activity(year):
+# --- CELL-LEVEL SAVES ---
+def _plain(value):
+    if pd.isna(value): return None
+    return value.item() if hasattr(value, "item") else value
+
+@profiler.timed()
+def diff_cells(before, after):
+    changes = []
+    for col in after.columns:
+        if col == SUBJECT_COL or col not in before.columns: continue
+        old, new = before[col].to_numpy(dtype=object), after[col].to_numpy(dtype=object)
+        same = (old == new) | (pd.isna(old) & pd.isna(new))
+        for i in np.flatnonzero(~same):
+            changes.append((before[SUBJECT_COL].iat[i], col, _plain(new[i])))
+    return changes
+
+def apply_changes(df, changes):
+    if not changes or SUBJECT_COL not in df.columns: return df
+    rows = {}
+    for i, subj in enumerate(df[SUBJECT_COL]): rows.setdefault(subj, []).append(i)
+    for subject, column, value in changes:
+        if subject not in rows:
+            if column != SUBJECT_COL: continue
+            # A journaled new row (add_subject): in place like every other change, its day cells unticked
+            rows[subject] = [len(df)]
+            df.loc[len(df)] = [subject if c == SUBJECT_COL else (False if str(c).startswith("Date ") else None) for c in df.columns]
+        if column not in df.columns: df[column] = False
+        loc = df.columns.get_loc(column)
+        try: df.iloc[rows[subject], loc] = value
+        except (TypeError, ValueError):
+            df[column] = df[column].astype(object)
+            df.iloc[rows[subject], loc] = value
+    return df
+
+def month_version(year, month_name):
+    return backend().month_version(year, month_name)
+
+@profiler.timed()
+def save_cells(year, month_name, changes, base_version=None):
+    # Returns True when the month changed since `base_version` (the version the
+    # edited view was loaded at): the cells are then merged onto the newer data
+    if not changes: return False
+    stale = backend().save_cells(year, month_name, changes, base_version)
+    if stale: profiler.count("save_cells.merged")
+    return stale
+
+def _save_journaled(year, month_name, changes, base_version):
     filename = get_file_path(year)
-    if not os.path.exists(filename): return pd.Series(dtype=int)
-    xls = pd.ExcelFile(filename)
-    all_dates = {}
-    for sheet in xls.sheet_names:
-        df = pd.read_excel(filename, sheet_name=sheet)
-        date_cols = [c for c in df.columns if c.startswith("Date ")]
-        for col in date_cols:
+    with workbook_lock(year):
+        stale = base_version is not None and sidecar.month_version(year, month_name) != base_version
+        old_stamp = sidecar.data_stamp(year, filename)
+        # Re-read under the lock: only the edited cells are written, on top of whatever other sessions saved
+        df = apply_changes(load_data(year, month_name), changes)
+        if sidecar.write_month(year, month_name, df) is None:
+            _save_sheet(df, year, month_name)  # sheet layout the sidecar can't hold
+            return stale
+        grid = to_grid(df)
+        sidecar.update_activity(year, grid)
+        sidecar.append_journal(year, month_name, changes)
+        sidecar.bump_month(year, month_name)
+        _patch_summary(year, month_name, old_stamp, lambda: grid)
+        _restamp(year, old_stamp, sidecar.data_stamp(year, filename))
+        invalidate(year, month_name)
+        return stale
+
+@profiler.timed()
+def compact_journal(year, attempts=5):
+    with workbook_lock(year):
+        entries = sidecar.read_journal(year)
+        if not entries: return True
+        filename = get_file_path(year)
+        fresh = sidecar.validate(year, filename)
+        # Coalesce: only the last value written to each cell reaches the workbook
+        cells = {}
+        for e in entries: cells[(e["month"], e["subject"], e["column"])] = e["value"]
+        from openpyxl import load_workbook
+        tmp = filename + ".tmp"
+        for attempt in range(attempts):
             try:
-                date_str = col.replace("Date ", "")
-                count = df[col].replace({'True': True, 'False': False}).fillna(False).sum()
-                all_dates[date_str] = count
-            except: pass
-    start_date = f"{year}-01-01"
-    end_date = f"{year}-12-31"
-    full_idx = pd.date_range(start=start_date, end=end_date, freq='D')
-    yearly_series = pd.Series(index=full_idx, data=0)
-    for date_str, count in all_dates.items():
+                profiler.count("compact_journal.attempts")
+                wb = load_workbook(filename)
+                _count_excel_read(filename)
+                for month_name in dict.fromkeys(m for m, _, _ in cells):
+                    if month_name not in wb.sheetnames: continue
+                    ws = wb[month_name]
+                    header = {cell.value: cell.column for cell in ws[1]}
+                    if SUBJECT_COL not in header: continue
+                    subj_col = header[SUBJECT_COL]
+                    rows = {}
+                    for r in range(2, ws.max_row + 1): rows.setdefault(ws.cell(row=r, column=subj_col).value, []).append(r)
+                    for (m, subject, column), value in cells.items():
+                        if m != month_name: continue
+                        if subject not in rows:
+                            if column != SUBJECT_COL: continue
+                            rows[subject] = [ws.max_row + 1]  # journaled add_subject: append the row
+                        if column not in header:
+                            header[column] = ws.max_column + 1
+                            ws.cell(row=1, column=header[column], value=column)
+                        for r in rows[subject]: ws.cell(row=r, column=header[column], value=value)
+                wb.save(tmp)
+                with sidecar.lock:
+                    old_stamp = sidecar.data_stamp(year, filename)
+                    os.replace(tmp, filename)
+                    sidecar.truncate_journal(year, len(entries))
+                    # Sidecars already hold these cells; only re-stamp if they were current before the write
+                    if fresh:
+                        sidecar.mark_synced(year, filename)
+                        _restamp(year, old_stamp, sidecar.data_stamp(year, filename))
+                return True
+            except PermissionError:
+                profiler.count("compact_journal.locked")
+                if attempt + 1 < attempts: time.sleep(0.5)
+        if os.path.exists(tmp): os.remove(tmp)
+        return False
+
+def to_grid(df):
+    return MonthGrid.from_frame(df)
+
+@profiler.timed()
+def load_grid(year, month_name):
+    return _cached(("grid", year, month_name), lambda: backend().load_grid(year, month_name))
+
+def _load_grid(year, month_name):
+    filename = get_file_path(year)
+    if sidecar.is_synced(year, filename):
+        grid = sidecar.read_grid(year, month_name)
+        if grid is not None: return grid
+    return to_grid(load_data(year, month_name))
+
+@profiler.timed()
+def rebuild_year_index(year):
+    filename = get_file_path(year)
+    # Locked like _load_frame; also runs in the year-matrix pool workers, hence the file lock
+    with workbook_lock(year):
+        counts = sidecar.read_activity(year) if sidecar.validate(year, filename) else None
+        if counts is not None: return counts
+        # One parse of the whole workbook refreshes the activity index and every month sidecar
+        sheets = _read_excel(filename)
+        counts = np.zeros(sidecar.days_in_year(year), dtype=np.int32)
+        for sheet, df in sheets.items():
+            apply_changes(df, sidecar.pending_changes(year, sheet))
+            sidecar.apply_month_activity(counts, year, to_grid(df))
+            if sheet in calendar.month_name[1:]: sidecar.write_month(year, sheet, df)
+        sidecar.write_activity(year, counts)
+        sidecar.mark_synced(year, filename)
+        return counts
+
+# --- EXTERNAL CHANGES ---
+def _month_changed(year, month_name, df):
+    old, new = sidecar.read_month(year, month_name), sidecar.normalize(df)
+    if old is None or new is None or list(old.columns) != list(new.columns): return True
+    return any(old[c].tolist() != new[c].tolist() for c in old.columns)
+
+@profiler.timed()
+def reload_workbook(year):
+    # The workbook was replaced outside this process (Excel, OneDrive): one parse,
+    # then only months whose cells differ from their sidecars are re-imported and
+    # evicted; the rest keep their sidecars and cache entries. Returns those months.
+    filename = get_file_path(year)
+    with workbook_lock(year):
+        if not os.path.exists(filename) or sidecar.is_synced(year, filename): return []
+        # The workbook's stat already moved: entries were cached under the stamp it was last synced at
+        old_stamp = sidecar.synced_stamp(year)
+        grids = {}
+        for month_name, df in _read_workbook(year).items():
+            if not _month_changed(year, month_name, df): continue
+            # A sheet the sidecar can't store (an extra column) must not keep serving its old .npz
+            if sidecar.write_month(year, month_name, df) is None: sidecar.drop_month(year, month_name)
+            grids[month_name] = to_grid(df)
+            sidecar.update_activity(year, grids[month_name])
+        if grids: sidecar.bump_month(year, *grids)
+        sidecar.mark_synced(year, filename)
+        stamp = old_stamp
+        for month_name, grid in grids.items():
+            _patch_summary(year, month_name, stamp, lambda: grid)
+            stamp = sidecar.data_stamp(year, filename)
+        _restamp(year, old_stamp, sidecar.data_stamp(year, filename))
+        for month_name in grids: invalidate(year, month_name)
+        return list(grids)
+
+@profiler.timed()
+def get_yearly_activity(year):
+    if not backend().exists(year): return pd.Series(dtype=int)
+    return _cached(("activity", year, None), lambda: _load_activity(year)).copy()
+
+def _workbook_activity(year):
+    filename = get_file_path(year)
+    counts = sidecar.read_activity(year) if sidecar.is_synced(year, filename) else None
+    return rebuild_year_index(year) if counts is None else counts
+
+def _load_activity(year):
+    counts = backend().year_activity(year)
+    full_idx = pd.date_range(start=f"{year}-01-01", end=f"{year}-12-31", freq='D')
+    return pd.Series(index=full_idx, data=counts.astype(int))
+
+# --- STORAGE BACKENDS ---
+# Every public read/write above dispatches through backend(). ExcelBackend is
+# the workbook + sidecar + journal path; SQLiteBackend keeps the same data
+# long-format in one WAL database (see sqlite_store). STUDYOS_BACKEND picks the
+# default; transfer() bulk-copies years from one backend to the other.
+def _read_workbook(year):
+    filename = get_file_path(year)
+    if not os.path.exists(filename): return {}
+    sheets = _read_excel(filename)
+    frames = {}
+    for sheet, df in sheets.items():
+        if sheet not in calendar.month_name[1:] or SUBJECT_COL not in df.columns: continue
+        frames[sheet] = apply_changes(_with_status(df), sidecar.pending_changes(year, sheet))
+    return frames
+
+def _write_workbook(year, frames):
+    filename = get_file_path(year)
+    with workbook_lock(year):
+        _replace_sheets(filename, {m: frames[m] for m in calendar.month_name[1:] if m in frames})
+        for month_name in frames: sidecar.truncate_journal(year, month_name=month_name)
+        sidecar.bump_month(year, *frames)
+        invalidate(year)
+
+class ExcelBackend:
+    name = "excel"
+    journaled = True  # cell edits sit in the journal until the write-behind thread compacts them
+
+    def years(self):
+        return _workbook_years()
+
+    def exists(self, year):
+        return os.path.exists(get_file_path(year))
+
+    def stamp(self, year):
+        # Workbook stat + manifest revision: also moves on journaled edits from other processes
+        return sidecar.data_stamp(year, get_file_path(year))
+
+    def data_stamp(self, year):
+        return sidecar.data_stamp(year, get_file_path(year))
+
+    def needs_parse(self, year):
+        filename = get_file_path(year)
+        return sidecar.file_stamp(filename) is not None and not sidecar.is_indexed(year, filename)
+
+    def load_month(self, year, month_name):
+        return _load_frame(year, month_name)
+
+    def load_grid(self, year, month_name):
+        return _load_grid(year, month_name)
+
+    def load_events(self, year, month_name):
+        frame = _cached(("frame", year, month_name), lambda: self.load_month(year, month_name))
+        return MonthEvents.from_frame(year, month_name, frame)
+
+    def add_subject(self, year, month_name, subject, rating, status):
+        return _add_row(year, month_name, subject, rating, status)
+
+    def save_month(self, df, year, month_name):
+        return _save_sheet(df, year, month_name)
+
+    def save_cells(self, year, month_name, changes, base_version=None):
+        return _save_journaled(year, month_name, changes, base_version)
+
+    def month_version(self, year, month_name):
+        return sidecar.month_version(year, month_name)
+
+    def year_activity(self, year):
+        return _workbook_activity(year)
+
+    def year_matrix(self, year):
+        return _workbook_matrix(year)
+
+    def months(self, year):
+        filename = get_file_path(year)
+        if not os.path.exists(filename): return []
+        try: sheets = set(pd.ExcelFile(filename).sheet_names)
+        except PermissionError as e: raise WorkbookLockedError(f"{filename} is open in another program") from e
+        except Exception as e: raise DataInitError(f"Could not read {filename}: {e}") from e
+        profiler.count("excel.opens")
+        return [m for m in calendar.month_name[1:] if m in sheets]
+
+    def read_year(self, year):
+        return _read_workbook(year)
+
+    def write_year(self, year, frames):
+        return _write_workbook(year, frames)
+
+class SQLiteBackend:
+    name = "sqlite"
+    journaled = False  # every write is already a committed transaction
+
+    def years(self):
+        return sqlite_store.years()
+
+    def exists(self, year):
+        return sqlite_store.has_year(year)
+
+    def stamp(self, year):
+        return sqlite_store.revision(year)
+
+    def data_stamp(self, year):
+        return sqlite_store.revision(year)
+
+    def needs_parse(self, year):
+        return False
+
+    def load_month(self, year, month_name):
+        df = sqlite_store.read_month(year, month_name)
+        if df is not None: return df
+        # Same rule as ensure_file_and_sheet_exist: a month opened for the first time gets the default subjects
+        self._write(year, month_name, lambda: sqlite_store.write_month(year, month_name, default_month_frame(year, month_name)))
+        return sqlite_store.read_month(year, month_name)
+
+    def load_grid(self, year, month_name):
+        return load_events(year, month_name).grid()
+
+    def load_events(self, year, month_name):
+        events = sqlite_store.read_events(year, month_name)
+        if events is not None: return events
+        self.load_month(year, month_name)  # seeds the month's default subjects
+        return sqlite_store.read_events(year, month_name)
+
+    def add_subject(self, year, month_name, subject, rating, status):
+        load_events(year, month_name)
+        return self._write(year, month_name, lambda: sqlite_store.add_subject(year, month_name, subject, rating, status))
+
+    def _write(self, year, month_name, write):
+        old_stamp = self.stamp(year)
+        try: result = write()
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e): raise WorkbookLockedError(f"{DB_PATH} is locked by another writer") from e
+            raise SaveError(f"Could not save {month_name} {year}: {e}") from e
+        except sqlite3.Error as e: raise SaveError(f"Could not save {month_name} {year}: {e}") from e
+        _patch_summary(year, month_name, old_stamp, lambda: sqlite_store.read_grid(year, month_name))
+        _restamp(year, old_stamp, self.stamp(year))
+        invalidate(year, month_name)
+        return result
+
+    def save_month(self, df, year, month_name):
+        self._write(year, month_name, lambda: sqlite_store.write_month(year, month_name, df))
+
+    def save_cells(self, year, month_name, changes, base_version=None):
+        # One indexed UPSERT per ticked cell instead of a sheet rewrite
+        return self._write(year, month_name, lambda: sqlite_store.update_cells(year, month_name, changes, base_version))
+
+    def month_version(self, year, month_name):
+        return sqlite_store.month_version(year, month_name)
+
+    def year_activity(self, year):
+        return sqlite_store.year_activity(year)
+
+    def year_matrix(self, year):
+        return sqlite_store.year_matrix(year)
+
+    def months(self, year):
+        return sqlite_store.months(year)
+
+    def read_year(self, year):
+        return sqlite_store.read_year(year)
+
+    def write_year(self, year, frames):
+        sqlite_store.write_year(year, frames)
+        invalidate(year)
+
+BACKENDS = {"excel": ExcelBackend, "sqlite": SQLiteBackend}
+_backends = {}
+_active = BACKEND
+
+def get_backend(name=None):
+    name = name or _active
+    if name not in BACKENDS: raise ValueError(f"Unknown storage backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    if name not in _backends: _backends[name] = BACKENDS[name]()
+    return _backends[name]
+
+def backend():
+    return get_backend()
+
+def set_backend(name):
+    global _active
+    get_backend(name)
+    _active = name
+    clear_caches()
+
+@profiler.timed()
+def transfer(source, target, years=None):
+    # Bulk copy, e.g. transfer("excel", "sqlite") to migrate or the reverse to export back to workbooks
+    src, dst = get_backend(source), get_backend(target)
+    copied = []
+    for year in years or src.years():
+        frames = src.read_year(year)
+        if not frames: continue
+        dst.write_year(year, frames)
+        copied.append(year)
+    clear_caches()
+    return copied
+
+# --- BULK IMPORT / EXPORT ---
+IMPORT_BATCH_SIZE = 5000
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch: yield batch
+
+def _import_year(store, year, changes_by_month):
+    # One read and one write of the year per batch; a month the year doesn't
+    # have yet starts from the sheet ensure_file_and_sheet_exist would create
+    existing = store.read_year(year)
+    frames = {}
+    for month_name, changes in changes_by_month.items():
+        df = existing.get(month_name)
+        if df is None: df = default_month_frame(year, month_name)
+        known = set(df[SUBJECT_COL])
+        new = [s for s in dict.fromkeys(s for s, _, _ in changes) if s not in known]
+        if new: df = pd.concat([df, pd.DataFrame({SUBJECT_COL: new, RATING_COL: 0, STATUS_COL: "Active"})], ignore_index=True)
+        frames[month_name] = apply_changes(df, changes).fillna(False)
+    store.write_year(year, frames)
+
+@profiler.timed()
+def import_events(records, batch_size=IMPORT_BATCH_SIZE):
+    # records: iterable of (subject, date, done), consumed one batch at a time
+    store = backend()
+    imported = 0
+    for batch in _batches(records, batch_size):
+        by_year = {}
+        for subject, day, done in batch:
+            months = by_year.setdefault(day.year, {})
+            months.setdefault(calendar.month_name[day.month], []).append((subject, f"Date {day:%Y-%m-%d}", bool(done)))
+        for year in sorted(by_year):
+            with workbook_lock(year) if store.journaled else nullcontext():
+                _import_year(store, year, by_year[year])
+        imported += len(batch)
+        profiler.count("import.batches")
+    return imported
+
+def export_events(years=None):
+    # Generator: one month's events in memory at a time, in date order
+    store = backend()
+    for year in years or store.years():
+        if not store.exists(year): continue
+        get_yearly_activity(year)  # one workbook parse refreshes every month sidecar
+        for month_name in store.months(year):
+            events = load_events(year, month_name)
+            order = np.lexsort((events.rows, events.days))
+            for row, day in zip(events.rows[order], events.days[order]):
+                yield events.subjects[row], events.dates[day][5:]
+
+# --- CROSS-YEAR HISTORY ---
+HISTORY_CACHE_SIZE = 4
+_year_matrices = {}
+_history = OrderedDict()
+_streak_index = {}
+
+@profiler.timed()
+def get_year_matrix(year):
+    store = backend()
+    cached = _year_matrices.get(year)
+    if cached and cached[0] == store.data_stamp(year): return cached[1], cached[2]
+    if not store.exists(year): return [], np.zeros((0, sidecar.days_in_year(year)), dtype=bool)
+    subjects, matrix = store.year_matrix(year)
+    _year_matrices[year] = (store.data_stamp(year), subjects, matrix)
+    return subjects, matrix
+
+def _workbook_matrix(year):
+    n_days = sidecar.days_in_year(year)
+    get_yearly_activity(year)  # guarantees every month sheet has a current sidecar
+    grids = {m: sidecar.read_grid(year, m) for m in calendar.month_name[1:]}
+    missing = [m for m, g in grids.items() if g is None]
+    if missing:
+        # Sheets the sidecar can't store (an extra column, say) have no .npz: read those from the workbook
+        sheets = set(get_backend("excel").months(year))
+        for m in missing: grids[m] = _load_grid(year, m) if m in sheets else None
+    grids = [g for g in grids.values() if g is not None]
+    subjects = list(dict.fromkeys(s for g in grids for s in g.subjects))
+    row_of = {s: i for i, s in enumerate(subjects)}
+    matrix = np.zeros((len(subjects), n_days), dtype=bool)
+    for g in grids:
+        offsets = sidecar.day_offsets(year, g.dates)
+        valid = (offsets >= 0) & (offsets < n_days)
+        rows = [row_of[s] for s in g.subjects]
+        matrix[np.ix_(rows, offsets[valid])] |= g.matrix[:, valid]
+    return subjects, matrix
+
+def _year_matrix_job(year):
+    # Process-pool entry point: each worker parses one workbook and refreshes its sidecars
+    return year, get_year_matrix(year)
+
+def _load_year_matrices(years):
+    store = backend()
+    cold = []
+    for y in years:
+        cached = _year_matrices.get(y)
+        if cached and cached[0] == store.data_stamp(y): continue
+        if store.needs_parse(y): cold.append(y)
+    if len(cold) > 1:
+        import multiprocessing  # only loads when several years are cold
+        from concurrent.futures import ProcessPoolExecutor
         try:
-            dt = pd.to_datetime(date_str)
-            if dt in yearly_series.index: yearly_series[dt] = count
-        except: pass
-    return yearly_series
-
-def calculate_global_streak(df, date_cols):
-    if df.empty or not date_cols: return 0
-    daily_activity = df[date_cols].replace({'True': True, 'False': False}).fillna(False).any(axis=0)
-    today = datetime.now()
-    today_str = f"Date {today.year}-{today.month:02d}-{today.day:02d}"
-    if today_str in daily_activity.index:
-        today_idx = list(daily_activity.index).index(today_str)
-        relevant_days = daily_activity.iloc[:today_idx+1]
-    else: relevant_days = daily_activity
-    streak = 0
-    values = relevant_days.values
-    for val in reversed(values):
-        if val: streak += 1
-        else: break
-    if streak == 0 and len(values) > 1:
-        prev_values = values[:-1]
-        prev_streak = 0
-        for val in reversed(prev_values):
-            if val: prev_streak += 1
-            else: break
-        if prev_streak > 0: streak = prev_streak
-    return streak
\ No newline at end of file
+            # spawn, not fork: a forked worker could inherit a cache/sidecar lock held by another server thread
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(len(cold), os.cpu_count() or 1), mp_context=context) as pool:
+                for y, (subjects, matrix) in pool.map(_year_matrix_job, cold):
+                    _year_matrices[y] = (store.data_stamp(y), subjects, matrix)
+        except (OSError, RuntimeError):
+            pass  # no usable process pool here: the loop below parses them in-process
+    return [get_year_matrix(y) for y in years]
+
+@profiler.timed()
+def get_history_index(last_year=None):
+    years = list_years()
+    first = years[0] if years else (last_year or date.today().year)
+    last = max(years[-1] if years else first, last_year or first)
+    span = list(range(first, last + 1))
+    store = backend()
+    key = tuple((y, store.data_stamp(y)) for y in span)
+    if key in _history:
+        _history.move_to_end(key)
+        return _history[key]
+    # Stitch every year end-to-end so ranges (and streaks) cross month and year boundaries
+    per_year = _load_year_matrices(span)
+    subjects = list(dict.fromkeys(s for subj, _ in per_year for s in subj))
+    row_of = {s: i for i, s in enumerate(subjects)}
+    blocks = []
+    for subj, matrix in per_year:
+        block = np.zeros((len(subjects), matrix.shape[1]), dtype=bool)
+        block[[row_of[s] for s in subj]] = matrix
+        blocks.append(block)
+    index = HistoryIndex(date(first, 1, 1), subjects, np.concatenate(blocks, axis=1), key)
+    _history[key] = index
+    while len(_history) > HISTORY_CACHE_SIZE: _history.popitem(last=False)
+    return index
+
+@profiler.timed()
+def get_history(start, end, subjects=None):
+    last = pd.Timestamp(end).year
+    return get_history_index(last).activity(start, end, subjects)
+
+@profiler.timed()
+def get_history_counts(start, end, subjects=None):
+    last = pd.Timestamp(end).year
+    return get_history_index(last).daily_counts(start, end, subjects)
+
+# --- SUMMARY TABLES ---
+_summaries = {}
+
+@profiler.timed()
+def get_year_summary(year):
+    store = backend()
+    summary = _summaries.get(year)
+    if summary is not None and summary.key == store.data_stamp(year): return summary
+    subjects, matrix = get_year_matrix(year)
+    summary = YearSummary(year, subjects, matrix, key=store.data_stamp(year))
+    _summaries[year] = summary
+    return summary
+
+def _patch_summary(year, month_name, old_stamp, month_grid):
+    # A save in this process patches its month into the year summary instead of forcing a rebuild
+    summary = _summaries.get(year)
+    if summary is None or summary.key != old_stamp: return
+    _summaries[year] = summary.with_month(month_name, month_grid(), key=backend().data_stamp(year))
+    profiler.count("summary.patched")
+
+# --- STREAKS ---
+def get_streak_index(today=None):
+    today = today or date.today()
+    history = get_history_index(today.year)
+    key = (history.key, today.year)
+    if key in _streak_index: return _streak_index[key]
+    window = history.until(date(today.year, 12, 31))
+    index = StreakIndex(window.start, window.subjects, window.matrix)
+    _streak_index.clear()
+    _streak_index[key] = index
+    return index
+
+@profiler.timed()
+def get_streak_report(today=None):
+    today = today or date.today()
+    return get_streak_index(today).at(today)
+
+def calculate_global_streak(today=None):
+    return get_streak_report(today).current
\ No newline at end of file
@@ -0,0 +1,18 @@
+# --- ENGINE ERRORS ---
+# data_engine raises these instead of reporting to the UI itself, so it runs the
+# same under Streamlit, the CLI, benchmarks and worker processes; app.py turns
+# them into st.error messages.
+
+class StudyOSError(Exception):
+    pass
+
+class DataInitError(StudyOSError):
+    # The year's storage or a month in it could not be opened or created
+    pass
+
+class SaveError(StudyOSError):
+    pass
+
+class WorkbookLockedError(SaveError):
+    # Another program (usually Excel) or another StudyOS process holds the file
+    pass
\ No newline at end of file
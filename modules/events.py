@@ -0,0 +1,78 @@
+import calendar
+import numpy as np
+import pandas as pd
+from .config import SUBJECT_COL, RATING_COL, STATUS_COL
+from .grid import MonthGrid, as_bool, date_columns
+
+# --- LONG-FORMAT MONTH MODEL ---
+# A month is its subject table (name, rating, status in sheet order) plus the
+# sparse list of completed (subject, day) events, held as two parallel int
+# arrays. Counts and totals are bincounts over the events, so they scale with
+# what was actually studied; the wide one-column-per-day layout only exists in
+# to_frame(), for the editor and the workbook.
+
+def month_dates(year, month_name):
+    m = list(calendar.month_name).index(month_name)
+    return [f"Date {year}-{m:02d}-{d:02d}" for d in range(1, calendar.monthrange(year, m)[1] + 1)]
+
+class MonthEvents:
+    def __init__(self, year, month_name, subjects, ratings, statuses, rows=(), days=()):
+        self.year = year
+        self.month_name = month_name
+        self.subjects = np.asarray(subjects, dtype=object)
+        self.ratings = np.asarray(ratings, dtype=float)
+        self.statuses = np.asarray(statuses, dtype=object)
+        self.dates = month_dates(year, month_name)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.days = np.asarray(days, dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, year, month_name, df):
+        # Wide -> long: only ticked cells of this month's date columns become events
+        n = len(df)
+        subjects = df[SUBJECT_COL].to_numpy() if SUBJECT_COL in df.columns else np.arange(n)
+        ratings = pd.to_numeric(df[RATING_COL], errors="coerce").fillna(0).to_numpy() if RATING_COL in df.columns else np.zeros(n)
+        statuses = df[STATUS_COL].fillna("Active").to_numpy() if STATUS_COL in df.columns else np.full(n, "Active", dtype=object)
+        slot = {c: i for i, c in enumerate(month_dates(year, month_name))}
+        cols = [c for c in date_columns(df) if c in slot]
+        rows, days = [], []
+        for c in cols:
+            hit = np.flatnonzero(as_bool(df[c]))
+            rows.append(hit)
+            days.append(np.full(len(hit), slot[c]))
+        if not cols: return cls(year, month_name, subjects, ratings, statuses)
+        return cls(year, month_name, subjects, ratings, statuses, np.concatenate(rows), np.concatenate(days))
+
+    @property
+    def day_strings(self):
+        return [c.replace("Date ", "") for c in self.dates]
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def __contains__(self, subject):
+        return subject in set(self.subjects)
+
+    def daily_counts(self):
+        return np.bincount(self.days, minlength=len(self.dates))
+
+    def grid(self):
+        matrix = np.zeros((len(self.subjects), len(self.dates)), dtype=bool)
+        matrix[self.rows, self.days] = True
+        return MonthGrid.from_matrix(self.subjects, self.dates, matrix)
+
+    def to_frame(self, dates=None):
+        # Long -> wide, the layout st.data_editor and the workbook sheets use; `dates` limits it to a window
+        dates = self.dates if dates is None else list(dates)
+        slot = {c: i for i, c in enumerate(dates)}
+        pos = np.array([slot.get(c, -1) for c in self.dates], dtype=np.int64)
+        keep = pos[self.days] >= 0
+        matrix = np.zeros((len(self.subjects), len(dates)), dtype=bool)
+        matrix[self.rows[keep], pos[self.days[keep]]] = True
+        df = pd.DataFrame({
+            SUBJECT_COL: self.subjects,
+            RATING_COL: self.ratings.astype("int64") if (self.ratings % 1 == 0).all() else self.ratings,
+            STATUS_COL: self.statuses,
+        })
+        days = pd.DataFrame(matrix, columns=dates, index=df.index)
+        return pd.concat([df, days], axis=1)
\ No newline at end of file
@@ -0,0 +1,48 @@
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- CROSS-PROCESS ADVISORY LOCK ---
+# flock() on POSIX, a one-byte msvcrt lock on Windows, taken on a small lock
+# file next to the data it protects. Advisory only: it orders StudyOS
+# processes (several servers, the CLI, the write-behind thread) between
+# themselves, it does not keep Excel out of the workbook.
+
+LOCK_TIMEOUT = 30.0
+POLL_SECONDS = 0.05
+
+def _try_lock(f):
+    if fcntl: fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+def _unlock(f):
+    if fcntl: fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    f = open(path, "a+b")
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() >= deadline: raise TimeoutError(f"Timed out waiting for {path}")
+                time.sleep(POLL_SECONDS)
+        try: yield
+        finally: _unlock(f)
+    finally:
+        f.close()
\ No newline at end of file
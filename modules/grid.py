@@ -0,0 +1,67 @@
+import numpy as np
+from .config import SUBJECT_COL
+
+# --- SUBJECT x DAY GRID ---
+# The sheet's date columns mix True/False, 'True'/'False' and NaN. They are
+# coerced once into a bit-packed bool matrix (one row per subject, one bit per
+# day) so every consumer works on plain vectorized numpy ops.
+
+def as_bool(series):
+    return series.isin([True, "True", "TRUE", 1]).to_numpy(dtype=bool)
+
+def date_columns(df):
+    return [c for c in df.columns if str(c).startswith("Date ")]
+
+class MonthGrid:
+    def __init__(self, subjects, dates, bits):
+        self.subjects = np.asarray(subjects, dtype=object)
+        self.dates = list(dates)
+        self.bits = bits
+        self._matrix = None
+        self._index = None
+
+    @classmethod
+    def from_matrix(cls, subjects, dates, matrix):
+        matrix = np.asarray(matrix, dtype=bool).reshape(len(subjects), len(dates))
+        grid = cls(subjects, dates, np.packbits(matrix, axis=1))
+        grid._matrix = matrix
+        return grid
+
+    @classmethod
+    def from_frame(cls, df):
+        dates = date_columns(df)
+        subjects = df[SUBJECT_COL].to_numpy() if SUBJECT_COL in df.columns else np.arange(len(df))
+        if not dates: return cls.from_matrix(subjects, dates, np.zeros((len(df), 0), dtype=bool))
+        matrix = np.column_stack([as_bool(df[c]) for c in dates])
+        return cls.from_matrix(subjects, dates, matrix)
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = np.unpackbits(self.bits, axis=1, count=len(self.dates)).astype(bool)
+        return self._matrix
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self.subjects)}
+        return self._index
+
+    @property
+    def day_strings(self):
+        return [c.replace("Date ", "") for c in self.dates]
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def row(self, subject):
+        return self.matrix[self.index[subject]]
+
+    def daily_counts(self):
+        return self.matrix.sum(axis=0)
+
+    def daily_any(self):
+        return self.matrix.any(axis=0)
+
+    def subject_totals(self):
+        return self.matrix.sum(axis=1)
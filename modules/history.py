@@ -0,0 +1,60 @@
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+
+# --- CROSS-YEAR HISTORY INDEX ---
+# Every year's subject x day matrix stitched end to end from Jan 1 of the first
+# workbook year. Range queries are plain slices of that matrix.
+
+def _as_date(value):
+    return pd.Timestamp(value).date()
+
+class HistoryIndex:
+    def __init__(self, start, subjects, matrix, key=None):
+        self.start = start
+        self.subjects = list(subjects)
+        self.matrix = matrix
+        self.key = key
+        self.counts = matrix.sum(axis=0)
+        self.row_of = {s: i for i, s in enumerate(self.subjects)}
+
+    @property
+    def end(self):
+        return self.start + timedelta(days=self.matrix.shape[1] - 1)
+
+    def day_index(self, day):
+        return (_as_date(day) - self.start).days
+
+    def _overlap(self, start, end):
+        # Positions of [start, end] inside the output range and inside the index
+        lo, hi = max(start, self.start), min(end, self.end)
+        if lo > hi: return None
+        return slice((lo - start).days, (hi - start).days + 1), slice(self.day_index(lo), self.day_index(hi) + 1)
+
+    def daily_counts(self, start, end, subjects=None):
+        start, end = _as_date(start), _as_date(end)
+        days = pd.date_range(start, end, freq="D")
+        out = np.zeros(len(days), dtype=int)
+        overlap = self._overlap(start, end)
+        if overlap:
+            rows = self.matrix if subjects is None else self.matrix[[self.row_of[s] for s in subjects if s in self.row_of]]
+            out[overlap[0]] = rows[:, overlap[1]].sum(axis=0)
+        return pd.Series(out, index=days)
+
+    def activity(self, start, end, subjects=None):
+        start, end = _as_date(start), _as_date(end)
+        subjects = self.subjects if subjects is None else list(subjects)
+        days = pd.date_range(start, end, freq="D")
+        out = np.zeros((len(days), len(subjects)), dtype=bool)
+        overlap = self._overlap(start, end)
+        if overlap:
+            for j, s in enumerate(subjects):
+                if s in self.row_of: out[overlap[0], j] = self.matrix[self.row_of[s], overlap[1]]
+        return pd.DataFrame(out, index=days, columns=subjects)
+
+    def until(self, day):
+        # Same index cut off after `day` (padded with empty days if it lies past the end)
+        n = self.day_index(day) + 1
+        matrix = self.matrix[:, :n]
+        if n > matrix.shape[1]: matrix = np.pad(matrix, ((0, 0), (0, n - matrix.shape[1])))
+        return HistoryIndex(self.start, self.subjects, matrix, self.key)
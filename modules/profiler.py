@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from .config import CACHE_DIR
+
+# --- HOT-PATH PROFILER ---
+# Off unless STUDYOS_PROFILE=1. When off, @timed returns the function
+# untouched and span()/count() are no-ops, so the instrumentation costs
+# nothing on the normal path. When on, every rerun is one "run": its spans
+# (nested, with depth) and counter deltas are kept for the sidebar panel and
+# appended as one JSON line to STUDYOS_PROFILE_LOG.
+
+ENABLED = os.environ.get("STUDYOS_PROFILE", "").lower() in ("1", "true", "yes", "on")
+LOG_PATH = os.environ.get("STUDYOS_PROFILE_LOG", os.path.join(CACHE_DIR, "profile.jsonl"))
+
+_local = threading.local()
+_counters = {}
+_counter_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+def _write(record):
+    with _log_lock:
+        os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+@contextmanager
+def _span(name):
+    run = getattr(_local, "run", None)
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        _local.depth = depth
+        entry = {"name": name, "ms": round(ms, 3), "depth": depth}
+        if run is not None:
+            entry["at_ms"] = round((start - run["_t0"]) * 1000, 3)
+            run["spans"].append(entry)
+        elif depth == 0:
+            # Outside a rerun (e.g. the write-behind thread): log the span on its own
+            _write({"ts": datetime.now().isoformat(timespec="milliseconds"), "thread": threading.current_thread().name, **entry})
+
+def span(name):
+    return _span(name) if ENABLED else nullcontext()
+
+def timed(name=None):
+    def decorate(fn):
+        if not ENABLED: return fn
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, n=1):
+    if not ENABLED: return
+    with _counter_lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def counters():
+    with _counter_lock:
+        return dict(_counters)
+
+def begin_run(label):
+    if not ENABLED: return
+    if getattr(_local, "run", None) is not None: end_run(aborted=True)  # st.rerun()/st.stop() skipped the end
+    _local.depth = 0
+    _local.run = {"label": label, "spans": [], "_t0": time.perf_counter(), "_counters": counters(),
+                  "ts": datetime.now().isoformat(timespec="milliseconds"), "thread": threading.current_thread().name}
+
+def end_run(aborted=False):
+    run = getattr(_local, "run", None)
+    if not ENABLED or run is None: return None
+    _local.run = None
+    before = run.pop("_counters")
+    run["total_ms"] = round((time.perf_counter() - run.pop("_t0")) * 1000, 3)
+    run["counters"] = {k: v - before.get(k, 0) for k, v in counters().items() if v != before.get(k, 0)}
+    run["aborted"] = aborted
+    _write(run)
+    return run
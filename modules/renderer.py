@@ -1,4 +1,17 @@
 import calendar
+import hashlib
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from . import profiler
+
+PALETTE = np.array(["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"])
+MONTH_ABBR = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+CELL_WIDTH = 13
+WEEKS = 54
+MEMO_SIZE = 32
 
 def get_color(count, max_val):
     if count == 0: return "#161b22"
@@ -9,53 +22,65 @@ def get_color(count, max_val):
     if intensity <= 0.75: return "#26a641"
     return "#39d353"
 
-def render_yearly_heatmap(series):
-    max_val = series.max()
-    colors = {}
-    titles = {}
-    for w in range(54):
-        for d in range(7):
-            colors[(w, d)] = "transparent"
-            titles[(w, d)] = ""
-    for date, count in series.items():
-        day_of_year = date.timetuple().tm_yday - 1
-        start_weekday = series.index[0].weekday()
-        week_idx = (day_of_year + start_weekday) // 7
-        weekday_idx = date.weekday()
-        if week_idx < 54:
-            colors[(week_idx, weekday_idx)] = get_color(count, max_val)
-            titles[(week_idx, weekday_idx)] = f"{date.strftime('%b %d')}: {count}"
-    
-    month_positions = {}
-    for date in series.index:
-        if date.day == 1:
-            day_of_year = date.timetuple().tm_yday - 1
-            start_weekday = series.index[0].weekday()
-            week_idx = (day_of_year + start_weekday) // 7
-            if date.month not in month_positions: month_positions[date.month] = week_idx
-                
-    month_html = '<div class="months-row">'
-    month_names = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    CELL_WIDTH = 13 
-    for m in range(1, 13):
-        if m in month_positions:
-            w_idx = month_positions[m]
-            left_px = w_idx * CELL_WIDTH
-            month_html += f'<div class="month-label" style="left: {left_px}px;">{month_names[m]}</div>'
-    month_html += '</div>'
-
-    grid_html = '<div class="squares-grid-year">'
-    for w in range(54):
-        for d in range(7):
-            c = colors.get((w, d), "transparent")
-            t = titles.get((w, d), "")
-            vis = "hidden" if c == "transparent" else "visible"
-            grid_html += f'<div class="day-cell" style="background-color: {c}; visibility: {vis};" title="{t}"></div>'
-    grid_html += '</div>'
+def get_colors(counts, max_val):
+    # Vectorized get_color: same 0 / <=25% / <=50% / <=75% / rest buckets
+    counts = np.asarray(counts)
+    buckets = np.searchsorted([0.25, 0.50, 0.75], counts / max(max_val, 1), side="left") + 1
+    return PALETTE[np.where(counts == 0, 0, buckets)]
+
+# --- MEMO ---
+_memo = OrderedDict()
+
+def clear_cache():
+    _memo.clear()
+    _year_template.cache_clear()
+
+def _memoized(key, counts, build):
+    # Keyed by a content hash of the counts, so an unchanged year/month is a dict hit
+    key = key + (hashlib.blake2b(np.ascontiguousarray(counts, dtype=np.int64).tobytes(), digest_size=16).hexdigest(),)
+    if key in _memo:
+        _memo.move_to_end(key)
+        profiler.count("render.memo_hit")
+        return _memo[key]
+    html = build()
+    _memo[key] = html
+    while len(_memo) > MEMO_SIZE: _memo.popitem(last=False)
+    return html
+
+# --- YEARLY MAP ---
+HIDDEN_CELL = '<div class="day-cell" style="background-color: transparent; visibility: hidden;" title=""></div>'
+
+@lru_cache(maxsize=16)
+def _year_template(year):
+    # Static per-year layout: grid slot of every day (column flow, 7 rows) and month label offsets
+    start = date(year, 1, 1)
+    offset = start.weekday()
+    n_days = 366 if calendar.isleap(year) else 365
+    titles = tuple(f'; visibility: visible;" title="{(start + timedelta(d)).strftime("%b %d")}: ' for d in range(n_days))
+    month_html = '<div class="months-row">' + "".join(
+        f'<div class="month-label" style="left: {((date(year, m, 1) - start).days + offset) // 7 * CELL_WIDTH}px;">{MONTH_ABBR[m]}</div>'
+        for m in range(1, 13)
+    ) + '</div>'
+    return offset, titles, month_html
+
+def _year_cells(year, counts, max_val, visible=None):
+    offset, titles, month_html = _year_template(year)
+    colors = get_colors(counts, max_val)
+    if visible is None: visible = np.ones(len(counts), dtype=bool)
+    cells = [HIDDEN_CELL] * offset
+    cells += [
+        f'<div class="day-cell" style="background-color: {c}{t}{n}"></div>' if v else HIDDEN_CELL
+        for c, t, n, v in zip(colors, titles, counts.tolist(), visible.tolist())
+    ]
+    cells += [HIDDEN_CELL] * (WEEKS * 7 - len(cells))
+    return month_html, '<div class="squares-grid-year">' + "".join(cells) + '</div>'
+
+def _build_year(year, counts, max_val=None, visible=None, heading=""):
+    month_html, grid_html = _year_cells(year, counts, counts.max() if max_val is None else max_val, visible)
 
     return f"""
     <div class="graph-container">
-      <div class="heatmap-center-wrapper">
+      <div class="heatmap-center-wrapper">{heading}
         {month_html}
         <div class="graph-body">
             <div class="weekdays-col">
@@ -69,32 +94,62 @@ def render_yearly_heatmap(series):
     </div>
     """
 
-def render_monthly_panel(df, year, month_name):
-    date_cols = [c for c in df.columns if c.startswith("Date ")]
-    daily_counts = {}
-    max_val = 1
-    for col in date_cols:
-        d_str = col.replace("Date ", "")
-        cnt = df[col].replace({'True': True, 'False': False}).fillna(False).sum()
-        daily_counts[d_str] = cnt
-        if cnt > max_val: max_val = cnt
+@profiler.timed()
+def render_yearly_heatmap(series):
+    year = series.index[0].year
+    counts = series.to_numpy()
+    return _memoized(("year", year), counts, lambda: _build_year(year, counts))
 
-    month_idx = list(calendar.month_name).index(month_name)
+# --- MULTI-YEAR MAP ---
+def _build_history(first, last, counts, visible):
+    # One year block per row, all sharing the range-wide max so colours compare across years
+    max_val = counts.max() if len(counts) else 0
+    blocks, pos = [], 0
+    for year in range(first, last + 1):
+        n = 366 if calendar.isleap(year) else 365
+        total = int(counts[pos:pos + n].sum())
+        heading = f'<div style="color: #e6edf3; font-size: 12px; font-weight: bold; margin-bottom: 5px;">{year} · {total} check-ins</div>'
+        blocks.append(_build_year(year, counts[pos:pos + n], max_val, visible[pos:pos + n], heading))
+        pos += n
+    return "".join(blocks)
+
+@profiler.timed()
+def render_history_heatmap(series):
+    if series.empty: return ""
+    first, last = series.index[0].year, series.index[-1].year
+    # Spread the range onto whole calendar years; days outside it stay hidden
+    full_idx = pd.date_range(f"{first}-01-01", f"{last}-12-31", freq="D")
+    counts = series.reindex(full_idx, fill_value=0).to_numpy()
+    visible = full_idx.isin(series.index)
+    key = ("history", first, last, series.index[0].toordinal(), series.index[-1].toordinal())
+    return _memoized(key, counts, lambda: _build_history(first, last, counts, visible))
+
+# --- MONTHLY MAP ---
+def _build_month(year, month_name, month_idx, counts):
+    max_val = max(1, int(counts.max())) if len(counts) else 1
+    colors = get_colors(counts, max_val)
     cal = calendar.monthcalendar(year, month_idx)
     
-    html = '<div class="graph-container" style="align-items: center; padding: 10px;">'
-    html += f'<div style="color: #e6edf3; font-size: 12px; font-weight: bold; margin-bottom: 5px;">{month_name}</div>'
-    html += '<div class="month-header">'
-    for d in ["M","T","W","T","F","S","S"]: html += f'<div>{d}</div>'
-    html += '</div>'
-    html += '<div class="heatmap-grid-month">'
+    html = ['<div class="graph-container" style="align-items: center; padding: 10px;">']
+    html.append(f'<div style="color: #e6edf3; font-size: 12px; font-weight: bold; margin-bottom: 5px;">{month_name}</div>')
+    html.append('<div class="month-header">' + "".join(f'<div>{d}</div>' for d in ["M","T","W","T","F","S","S"]) + '</div>')
+    html.append('<div class="heatmap-grid-month">')
     for week in cal:
         for day in week:
-            if day == 0: html += '<div class="month-cell" style="background-color: transparent; border: none;"></div>'
+            if day == 0: html.append('<div class="month-cell" style="background-color: transparent; border: none;"></div>')
             else:
                 d_str = f"{year}-{month_idx:02d}-{day:02d}"
-                count = daily_counts.get(d_str, 0)
-                color = get_color(count, max_val)
-                html += f'<div class="month-cell" style="background-color: {color};" title="{d_str}: {count}">{day}</div>'
-    html += '</div></div>'
-    return html
\ No newline at end of file
+                count, color = (int(counts[day - 1]), colors[day - 1]) if day <= len(counts) else (0, PALETTE[0])
+                html.append(f'<div class="month-cell" style="background-color: {color};" title="{d_str}: {count}">{day}</div>')
+    html.append('</div></div>')
+    return "".join(html)
+
+@profiler.timed()
+def render_monthly_panel(grid, year, month_name):
+    month_idx = list(calendar.month_name).index(month_name)
+    # Align the date columns (MonthGrid or MonthEvents) onto day-of-month slots
+    counts = np.zeros(calendar.monthrange(year, month_idx)[1], dtype=np.int64)
+    prefix = f"{year}-{month_idx:02d}-"
+    for d_str, cnt in zip(grid.day_strings, grid.daily_counts().tolist()):
+        if d_str.startswith(prefix) and d_str[8:].isdigit() and 1 <= int(d_str[8:]) <= len(counts): counts[int(d_str[8:]) - 1] = cnt
+    return _memoized(("month", year, month_name), counts, lambda: _build_month(year, month_name, month_idx, counts))
@@ -0,0 +1,268 @@
+import os
+import json
+import calendar
+import threading
+import numpy as np
+import pandas as pd
+from .config import SUBJECT_COL, RATING_COL, STATUS_COL, CACHE_DIR
+from .grid import MonthGrid, as_bool, date_columns
+from . import profiler
+
+# --- BINARY SIDECAR STORE ---
+# One compact .npz per (year, month) holding the subject/rating/status columns
+# plus the day grid as a row-packed bitmap (see grid.MonthGrid). The .xlsx
+# stays the export target; the manifest records the workbook stamp we last
+# synced with, so an external Excel edit (new mtime/size) drops the sidecars
+# and forces a re-import.
+# A per-year activity.npy (one count per calendar day) backs the yearly heatmap
+# and is patched month-by-month on save. Cell-level edits are also appended to
+# journal.jsonl (a write-ahead log) until they are compacted into the workbook.
+
+SIDECAR_VERSION = 2
+
+# Guards manifest/journal read-modify-write between sessions and the write-behind thread
+lock = threading.RLock()
+
+def _year_dir(year):
+    return os.path.join(CACHE_DIR, str(year))
+
+def _month_path(year, month_name):
+    return os.path.join(_year_dir(year), f"{month_name}.npz")
+
+def _activity_path(year):
+    return os.path.join(_year_dir(year), "activity.npy")
+
+def _journal_path(year):
+    return os.path.join(_year_dir(year), "journal.jsonl")
+
+def _manifest_path(year):
+    return os.path.join(_year_dir(year), "manifest.json")
+
+def lock_path(year):
+    return os.path.join(_year_dir(year), "write.lock")
+
+def file_stamp(filename):
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+_manifests = {}
+
+def _read_manifest(year):
+    # Re-read only when the manifest file itself changed on disk
+    path = _manifest_path(year)
+    stamp = file_stamp(path)
+    cached = _manifests.get(year)
+    if cached and cached[0] == stamp: return dict(cached[1])
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    _manifests[year] = (stamp, manifest)
+    return dict(manifest)
+
+def _write_manifest(year, manifest):
+    os.makedirs(_year_dir(year), exist_ok=True)
+    path = _manifest_path(year)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+    _manifests[year] = (file_stamp(path), dict(manifest))
+
+def validate(year, filename):
+    with lock:
+        stored = _read_manifest(year).get("stamp")
+        if stored and tuple(stored) == file_stamp(filename): return True
+        # Workbook changed outside the app (or never synced): drop every month
+        directory = _year_dir(year)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith((".npz", ".npy")): os.remove(os.path.join(directory, name))
+        return False
+
+def is_synced(year, filename):
+    # Non-destructive validate(): the workbook is still the one the sidecars were built from
+    stored = _read_manifest(year).get("stamp")
+    return bool(stored) and tuple(stored) == file_stamp(filename)
+
+def is_indexed(year, filename):
+    # Non-destructive check: sidecars current and the yearly index already built
+    return is_synced(year, filename) and os.path.exists(_activity_path(year))
+
+def mark_synced(year, filename):
+    with lock:
+        manifest = _read_manifest(year)
+        manifest["stamp"] = file_stamp(filename)
+        _write_manifest(year, manifest)
+
+def month_version(year, month_name):
+    return _read_manifest(year).get("versions", {}).get(month_name, 0)
+
+def bump_month(year, *month_names):
+    # Per-month edit counter for stale-edit detection; also bumps the year revision
+    with lock:
+        manifest = _read_manifest(year)
+        versions = dict(manifest.get("versions", {}))
+        for month_name in month_names: versions[month_name] = versions.get(month_name, 0) + 1
+        manifest["versions"] = versions
+        manifest["revision"] = manifest.get("revision", 0) + 1
+        _write_manifest(year, manifest)
+
+def synced_stamp(year):
+    # data_stamp() as of the last mark_synced(): what cache entries were stamped with before an outside write
+    manifest = _read_manifest(year)
+    stored = manifest.get("stamp")
+    return (tuple(stored) if stored else None), manifest.get("revision", 0)
+
+def drop_month(year, month_name):
+    path = _month_path(year, month_name)
+    if os.path.exists(path): os.remove(path)
+
+def data_stamp(year, filename):
+    # Changes whenever the workbook or any sidecar-only (journaled) edit changes
+    return file_stamp(filename), _read_manifest(year).get("revision", 0)
+
+def normalize(df):
+    date_cols = date_columns(df)
+    known = {SUBJECT_COL, RATING_COL, STATUS_COL, *date_cols}
+    if SUBJECT_COL not in df.columns or any(c not in known for c in df.columns):
+        return None
+    out = pd.DataFrame({
+        SUBJECT_COL: df[SUBJECT_COL].fillna("").astype(str).to_numpy(),
+        RATING_COL: pd.to_numeric(df.get(RATING_COL, 0), errors="coerce"),
+        STATUS_COL: df.get(STATUS_COL, "Active"),
+    }, index=range(len(df)))
+    out[RATING_COL] = out[RATING_COL].fillna(0)
+    out[STATUS_COL] = out[STATUS_COL].fillna("Active").astype(str)
+    if (out[RATING_COL] % 1 == 0).all(): out[RATING_COL] = out[RATING_COL].astype("int64")
+    days = {c: as_bool(df[c]) for c in date_cols}
+    return pd.concat([out, pd.DataFrame(days, index=out.index)], axis=1)
+
+def write_month(year, month_name, df):
+    df = normalize(df)
+    if df is None: return None
+    grid = MonthGrid.from_frame(df)
+    os.makedirs(_year_dir(year), exist_ok=True)
+    path = _month_path(year, month_name)
+    tmp = path + ".tmp.npz"
+    np.savez(
+        tmp,
+        version=np.array(SIDECAR_VERSION),
+        subjects=df[SUBJECT_COL].to_numpy(dtype=str),
+        ratings=df[RATING_COL].to_numpy(dtype=float),
+        statuses=df[STATUS_COL].to_numpy(dtype=str),
+        dates=np.array(grid.dates, dtype=str),
+        grid=grid.bits,
+    )
+    os.replace(tmp, path)
+    return df
+
+def _read(year, month_name):
+    path = _month_path(year, month_name)
+    if not os.path.exists(path): return None
+    if profiler.ENABLED:
+        profiler.count("sidecar.reads")
+        profiler.count("sidecar.bytes_read", os.path.getsize(path))
+    try:
+        with np.load(path) as data:
+            if int(data["version"]) != SIDECAR_VERSION: return None
+            subjects = data["subjects"].astype(object)
+            grid = MonthGrid(subjects, [str(c) for c in data["dates"]], data["grid"])
+            return grid, data["ratings"], data["statuses"].astype(object)
+    except (OSError, KeyError, ValueError):
+        return None
+
+def read_grid(year, month_name):
+    stored = _read(year, month_name)
+    return None if stored is None else stored[0]
+
+def read_month(year, month_name):
+    stored = _read(year, month_name)
+    if stored is None: return None
+    grid, ratings, statuses = stored
+    df = pd.DataFrame({
+        SUBJECT_COL: grid.subjects,
+        RATING_COL: ratings.astype("int64") if (ratings % 1 == 0).all() else ratings,
+        STATUS_COL: statuses,
+    })
+    days = pd.DataFrame(grid.matrix, columns=grid.dates, index=df.index)
+    return pd.concat([df, days], axis=1)
+
+# --- YEARLY ACTIVITY INDEX ---
+def days_in_year(year):
+    return 366 if calendar.isleap(year) else 365
+
+def day_offsets(year, date_cols):
+    dates = pd.to_datetime([c.replace("Date ", "") for c in date_cols], errors="coerce")
+    offsets = (dates - pd.Timestamp(year=year, month=1, day=1)).days
+    return np.asarray(offsets.fillna(-1), dtype=int)
+
+def apply_month_activity(counts, year, grid):
+    if not grid.dates: return counts
+    sums = grid.daily_counts()
+    offsets = day_offsets(year, grid.dates)
+    valid = (offsets >= 0) & (offsets < len(counts))
+    counts[offsets[valid]] = sums[valid]
+    return counts
+
+def read_activity(year):
+    try:
+        counts = np.load(_activity_path(year))
+    except (OSError, ValueError):
+        return None
+    return counts if len(counts) == days_in_year(year) else None
+
+def write_activity(year, counts):
+    os.makedirs(_year_dir(year), exist_ok=True)
+    path = _activity_path(year)
+    tmp = path + ".tmp.npy"
+    np.save(tmp, np.asarray(counts, dtype=np.int32))
+    os.replace(tmp, path)
+
+def update_activity(year, grid):
+    counts = read_activity(year)
+    if counts is None: return
+    write_activity(year, apply_month_activity(counts, year, grid))
+
+# --- WRITE-AHEAD JOURNAL ---
+def append_journal(year, month_name, changes):
+    os.makedirs(_year_dir(year), exist_ok=True)
+    with lock, open(_journal_path(year), "a", encoding="utf-8") as f:
+        for subject, column, value in changes:
+            f.write(json.dumps({"month": month_name, "subject": subject, "column": column, "value": value}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_journal(year):
+    try:
+        with open(_journal_path(year), "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        try: entries.append(json.loads(line))
+        except ValueError: pass  # torn tail write
+    return entries
+
+def pending_changes(year, month_name):
+    return [(e["subject"], e["column"], e["value"]) for e in read_journal(year) if e["month"] == month_name]
+
+def truncate_journal(year, count=None, month_name=None):
+    # Drop the first `count` entries (all if None, optionally one month only), keeping anything appended since
+    with lock:
+        entries = read_journal(year)
+        end = len(entries) if count is None else count
+        keep = [e for i, e in enumerate(entries) if i >= end or (month_name is not None and e["month"] != month_name)]
+        path = _journal_path(year)
+        if not keep:
+            if os.path.exists(path): os.remove(path)
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in keep: f.write(json.dumps(e) + "\n")
+        os.replace(tmp, path)
@@ -0,0 +1,218 @@
+import calendar
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from .config import SUBJECT_COL, RATING_COL, STATUS_COL, DB_PATH
+from .grid import as_bool, date_columns
+from .events import MonthEvents
+from . import profiler
+
+# --- SQLITE STORE ---
+# The same data the workbooks hold, kept long-format in one WAL database:
+# `subjects` has one row per (year, month, subject) with rating/status and the
+# sheet order, `ticks` one row per (subject, day). Ticks are sparse: a full
+# month write only stores done days, a single edit is one UPSERT. Day-range
+# reads go through the (day, done) index. `revisions` is bumped by every write
+# so caches can tell the data changed, including from another process, and
+# `versions` per (year, month) lets a save detect it started from stale data.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    rating REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'Active',
+    PRIMARY KEY (year, month, subject)
+);
+CREATE TABLE IF NOT EXISTS ticks (
+    subject TEXT NOT NULL,
+    day TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    PRIMARY KEY (subject, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ticks_by_day ON ticks (day, done);
+CREATE TABLE IF NOT EXISTS revisions (
+    year INTEGER PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (year, month)
+);
+"""
+
+UPSERT_TICK = "INSERT INTO ticks (subject, day, done) VALUES (?, ?, ?) ON CONFLICT (subject, day) DO UPDATE SET done = excluded.done"
+
+_local = threading.local()
+
+def connect(path=None):
+    # sqlite3 connections are bound to their thread: one per (thread, database)
+    path = path or DB_PATH
+    conns = _local.__dict__.setdefault("conns", {})
+    if path not in conns:
+        conn = sqlite3.connect(path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")  # readers never block the writer
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        conns[path] = conn
+    return conns[path]
+
+def month_index(month_name):
+    return list(calendar.month_name).index(month_name)
+
+def month_range(year, month_name):
+    m = month_index(month_name)
+    return f"{year}-{m:02d}-01", f"{year}-{m:02d}-{calendar.monthrange(year, m)[1]:02d}"
+
+def _bump(conn, year, *month_names):
+    conn.execute("INSERT INTO revisions (year, revision) VALUES (?, 1) ON CONFLICT (year) DO UPDATE SET revision = revision + 1", (year,))
+    conn.executemany("INSERT INTO versions (year, month, version) VALUES (?, ?, 1) ON CONFLICT (year, month) DO UPDATE SET version = version + 1",
+                     [(year, month_index(m)) for m in month_names])
+
+def _version(conn, year, month_name):
+    row = conn.execute("SELECT version FROM versions WHERE year = ? AND month = ?", (year, month_index(month_name))).fetchone()
+    return row[0] if row else 0
+
+def month_version(year, month_name):
+    return _version(connect(), year, month_name)
+
+def years():
+    return [y for (y,) in connect().execute("SELECT DISTINCT year FROM subjects ORDER BY year")]
+
+def revision(year):
+    row = connect().execute("SELECT revision FROM revisions WHERE year = ?", (year,)).fetchone()
+    return row[0] if row else 0
+
+def months(year):
+    return [calendar.month_name[m] for (m,) in connect().execute("SELECT DISTINCT month FROM subjects WHERE year = ? ORDER BY month", (year,))]
+
+def has_year(year):
+    return connect().execute("SELECT 1 FROM subjects WHERE year = ? LIMIT 1", (year,)).fetchone() is not None
+
+def _subjects(conn, year, month_name):
+    return conn.execute(
+        "SELECT subject, rating, status FROM subjects WHERE year = ? AND month = ? ORDER BY position",
+        (year, month_index(month_name))).fetchall()
+
+def _done(conn, start, end):
+    profiler.count("sqlite.range_queries")
+    return conn.execute("SELECT subject, day FROM ticks WHERE day BETWEEN ? AND ? AND done = 1", (start, end)).fetchall()
+
+def read_events(year, month_name):
+    conn = connect()
+    rows = _subjects(conn, year, month_name)
+    if not rows: return None
+    row_of = {r[0]: i for i, r in enumerate(rows)}
+    done = [(row_of[s], int(day[8:]) - 1) for s, day in _done(conn, *month_range(year, month_name)) if s in row_of]
+    return MonthEvents(year, month_name, [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows],
+                       [r for r, _ in done], [d for _, d in done])
+
+def read_grid(year, month_name):
+    events = read_events(year, month_name)
+    return None if events is None else events.grid()
+
+def read_month(year, month_name):
+    events = read_events(year, month_name)
+    return None if events is None else events.to_frame()
+
+def _month_rows(year, month_name, df):
+    # Duplicate subject rows can't share a key here: the first one wins, as in the grid lookups
+    df = df.drop_duplicates(SUBJECT_COL)
+    subjects = df[SUBJECT_COL].fillna("").astype(str).tolist()
+    ratings = pd.to_numeric(df[RATING_COL], errors="coerce").fillna(0) if RATING_COL in df.columns else [0] * len(df)
+    statuses = df[STATUS_COL].fillna("Active").astype(str) if STATUS_COL in df.columns else ["Active"] * len(df)
+    m = month_index(month_name)
+    rows = [(year, m, i, s, float(r), status) for i, (s, r, status) in enumerate(zip(subjects, ratings, statuses))]
+    ticks = []
+    for col in date_columns(df):
+        day = col.replace("Date ", "")
+        ticks.extend((s, day, 1) for s, done in zip(subjects, as_bool(df[col])) if done)
+    return rows, ticks
+
+def _replace_month(conn, year, month_name, df):
+    rows, ticks = _month_rows(year, month_name, df)
+    conn.execute("DELETE FROM subjects WHERE year = ? AND month = ?", (year, month_index(month_name)))
+    conn.execute("DELETE FROM ticks WHERE day BETWEEN ? AND ?", month_range(year, month_name))
+    conn.executemany("INSERT INTO subjects (year, month, position, subject, rating, status) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany(UPSERT_TICK, ticks)
+
+def write_month(year, month_name, df):
+    conn = connect()
+    with conn:
+        _replace_month(conn, year, month_name, df)
+        _bump(conn, year, month_name)
+
+def write_year(year, frames):
+    # Bulk import: every month of a year in one transaction
+    conn = connect()
+    with conn:
+        months = [m for m, df in frames.items() if m in calendar.month_name[1:] and SUBJECT_COL in df.columns]
+        for month_name in months: _replace_month(conn, year, month_name, frames[month_name])
+        _bump(conn, year, *months)
+
+def read_year(year):
+    frames = {}
+    for month_name in calendar.month_name[1:]:
+        df = read_month(year, month_name)
+        if df is not None: frames[month_name] = df
+    return frames
+
+def add_subject(year, month_name, subject, rating=0, status="Active"):
+    # One subjects row, appended after the month's last position; no tick rows
+    conn = connect()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        added = conn.execute(
+            "INSERT INTO subjects (year, month, position, subject, rating, status) "
+            "SELECT ?, ?, COALESCE(MAX(position) + 1, 0), ?, ?, ? FROM subjects WHERE year = ? AND month = ? "
+            "ON CONFLICT (year, month, subject) DO NOTHING",
+            (year, month_index(month_name), subject, float(rating), status, year, month_index(month_name))).rowcount > 0
+        if added: _bump(conn, year, month_name)
+    return added
+
+def update_cells(year, month_name, changes, base_version=None):
+    # Cell-level UPSERTs on the current rows; returns True if the month moved past base_version
+    conn = connect()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")  # version check and writes as one unit against other processes
+        stale = base_version is not None and _version(conn, year, month_name) != base_version
+        known = {r[0] for r in _subjects(conn, year, month_name)}
+        m = month_index(month_name)
+        for subject, column, value in changes:
+            if subject not in known: continue
+            if str(column).startswith("Date "):
+                conn.execute(UPSERT_TICK, (subject, column.replace("Date ", ""), int(value in (True, "True", "TRUE", 1))))
+            elif column == RATING_COL:
+                conn.execute("UPDATE subjects SET rating = ? WHERE year = ? AND month = ? AND subject = ?", (float(value or 0), year, m, subject))
+            elif column == STATUS_COL:
+                conn.execute("UPDATE subjects SET status = ? WHERE year = ? AND month = ? AND subject = ?", (value or "Active", year, m, subject))
+        _bump(conn, year, month_name)
+    return stale
+
+def year_activity(year):
+    n_days = 366 if calendar.isleap(year) else 365
+    counts = np.zeros(n_days, dtype=np.int32)
+    rows = connect().execute(
+        "SELECT day, COUNT(*) FROM ticks WHERE day BETWEEN ? AND ? AND done = 1 GROUP BY day",
+        (f"{year}-01-01", f"{year}-12-31")).fetchall()
+    if rows:
+        offsets = (pd.to_datetime([d for d, _ in rows]) - pd.Timestamp(year=year, month=1, day=1)).days
+        counts[np.asarray(offsets)] = [c for _, c in rows]
+    return counts
+
+def year_matrix(year):
+    conn = connect()
+    n_days = 366 if calendar.isleap(year) else 365
+    subjects = list(dict.fromkeys(s for (s,) in conn.execute("SELECT subject FROM subjects WHERE year = ? ORDER BY month, position", (year,))))
+    row_of = {s: i for i, s in enumerate(subjects)}
+    matrix = np.zeros((len(subjects), n_days), dtype=bool)
+    done = [(row_of[s], d) for s, d in _done(conn, f"{year}-01-01", f"{year}-12-31") if s in row_of]
+    if done:
+        offsets = (pd.to_datetime([d for _, d in done]) - pd.Timestamp(year=year, month=1, day=1)).days
+        matrix[[r for r, _ in done], np.asarray(offsets)] = True
+    return subjects, matrix
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import threading
+from importlib.abc import MetaPathFinder
+
+# --- STARTUP IMPORT TIMING ---
+# Off unless STUDYOS_IMPORT_TIMES=1. When on, a meta-path hook times every
+# module body as it executes and keeps inclusive and self time (children
+# subtracted), the same split `python -X importtime` prints, but collected
+# in-process so lazy imports triggered by a rerun show up too.
+# `python -m modules.startup` prints the table for a cold app import.
+
+ENABLED = os.environ.get("STUDYOS_IMPORT_TIMES", "").lower() in ("1", "true", "yes", "on")
+APP_IMPORTS = ["streamlit", "pandas", "modules.config", "modules.data_engine", "modules.renderer", "modules.writer", "modules.profiler"]
+
+_local = threading.local()
+_times = {}
+_times_lock = threading.Lock()
+
+def _timed(name, exec_module):
+    def run(module):
+        stack = _local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try: exec_module(module)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            children = stack.pop()
+            if stack: stack[-1] += total
+            with _times_lock: _times[name] = (round(total - children, 3), round(total, 3))
+    return run
+
+class _ImportTimer(MetaPathFinder):
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"): continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None: break
+        else: return None
+        loader = spec.loader
+        # Builtin/frozen importers are shared classes; only per-module loader instances get wrapped
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"): return spec
+        loader.exec_module = _timed(name, loader.exec_module)
+        return spec
+
+_timer = _ImportTimer()
+
+def install(force=False):
+    if not (ENABLED or force) or _timer in sys.meta_path: return
+    sys.meta_path.insert(0, _timer)
+
+def report(limit=None):
+    with _times_lock:
+        rows = [{"module": m, "self_ms": s, "total_ms": t} for m, (s, t) in _times.items()]
+    rows.sort(key=lambda r: r["self_ms"], reverse=True)
+    return rows[:limit] if limit else rows
+
+def cold_start():
+    install(force=True)
+    start = time.perf_counter()
+    for name in APP_IMPORTS: __import__(name)
+    return (time.perf_counter() - start) * 1000
+
+if __name__ == "__main__":
+    total = cold_start()
+    print(f"{'module':<48} {'self ms':>10} {'total ms':>10}")
+    for row in report(30): print(f"{row['module']:<48} {row['self_ms']:>10.1f} {row['total_ms']:>10.1f}")
+    print(f"\napp imports: {total:.1f} ms ({len(_times)} modules)")
\ No newline at end of file
@@ -0,0 +1,43 @@
+from collections import namedtuple
+from datetime import date
+import numpy as np
+
+# --- VECTORIZED STREAK ENGINE ---
+# run_lengths() turns a bool day vector (or a subjects x days matrix) into the
+# length of the streak ending on each day, so any "streak as of day t" query
+# is a single array lookup once the index has been built.
+
+StreakReport = namedtuple("StreakReport", ["current", "longest", "subjects"])
+
+def run_lengths(active):
+    active = np.asarray(active, dtype=bool)
+    idx = np.arange(active.shape[-1])
+    last_gap = np.maximum.accumulate(np.where(active, -1, idx), axis=-1)
+    return idx - last_gap
+
+def current_at(runs, day_idx):
+    if runs.shape[-1] == 0 or day_idx < 0: return np.zeros(runs.shape[:-1], dtype=int)
+    day_idx = min(day_idx, runs.shape[-1] - 1)
+    streak = runs[..., day_idx]
+    # Today not ticked yet: the streak still counts up to yesterday
+    if day_idx > 0: streak = np.where(streak == 0, runs[..., day_idx - 1], streak)
+    return streak
+
+class StreakIndex:
+    def __init__(self, start, subjects, matrix):
+        self.start = start
+        self.subjects = list(subjects)
+        self.subject_runs = run_lengths(matrix)
+        self.runs = run_lengths(matrix.any(axis=0))
+        self.longest = int(self.runs.max(initial=0))
+        self.subject_longest = self.subject_runs.max(axis=1, initial=0)
+
+    def day_index(self, day):
+        return (day - self.start).days
+
+    def at(self, day=None):
+        day_idx = self.day_index(day or date.today())
+        current = int(current_at(self.runs, day_idx))
+        per_subject = current_at(self.subject_runs, day_idx)
+        subjects = {s: (int(c), int(l)) for s, c, l in zip(self.subjects, per_subject, self.subject_longest)}
+        return StreakReport(current, self.longest, subjects)
@@ -0,0 +1,82 @@
+import calendar
+from datetime import date
+import numpy as np
+from .streaks import run_lengths
+
+# --- YEAR SUMMARY TABLES ---
+# Per-subject rollups of one year's subject x day matrix: year totals, monthly
+# sums, a running sum for O(1) rolling-window rates, and streak runs. A save patches only the saved month's columns (and what
+# follows them in the running sums/runs) via with_month(), instead of
+# rebuilding the year from raw cells.
+
+class YearSummary:
+    def __init__(self, year, subjects, matrix, key=None):
+        self.year = year
+        self.start = date(year, 1, 1)
+        self.subjects = list(subjects)
+        self.row_of = {s: i for i, s in enumerate(self.subjects)}
+        self.matrix = np.asarray(matrix, dtype=bool)
+        self.key = key
+        self.month_starts = np.array([(date(year, m, 1) - self.start).days for m in range(1, 13)])
+        self._refresh(0)
+
+    def _refresh(self, first):
+        # Recompute everything derived from day `first` onward; earlier values are untouched
+        n_days = self.matrix.shape[1]
+        if first == 0:
+            self.cumsum = np.zeros((len(self.subjects), n_days + 1), dtype=np.int32)
+            self.runs = np.zeros(self.matrix.shape, dtype=np.int64)
+        self.cumsum[:, first + 1:] = self.cumsum[:, first:first + 1] + np.cumsum(self.matrix[:, first:], axis=1, dtype=np.int32)
+        runs = run_lengths(self.matrix[:, first:])
+        if first > 0:
+            # Runs that reach back to `first` continue the streak standing the day before
+            leading = runs == np.arange(1, runs.shape[1] + 1)
+            runs = runs + np.where(leading, self.runs[:, first - 1:first], 0)
+        self.runs[:, first:] = runs
+        # Rollups are differences of the running sum at period boundaries
+        self.totals = self.cumsum[:, -1]
+        self.monthly = np.diff(self.cumsum[:, np.append(self.month_starts, n_days)], axis=1)
+        self.longest = self.runs.max(axis=1, initial=0)
+
+    def with_month(self, month_name, grid, key=None):
+        # Copy-on-write: readers of the current summary never see a half-patched one
+        m = list(calendar.month_name).index(month_name)
+        first = int(self.month_starts[m - 1])
+        last = first + calendar.monthrange(self.year, m)[1]
+        subjects = self.subjects + [s for s in dict.fromkeys(grid.subjects) if s not in self.row_of]
+        matrix = np.zeros((len(subjects), self.matrix.shape[1]), dtype=bool)
+        matrix[:len(self.subjects)] = self.matrix
+        matrix[:, first:last] = False
+        row_of = {s: i for i, s in enumerate(subjects)}
+        offsets = np.array([(date.fromisoformat(c.replace("Date ", "")) - self.start).days for c in grid.dates], dtype=np.int64)
+        valid = (offsets >= first) & (offsets < last)
+        rows = [row_of[s] for s in grid.subjects]
+        matrix[np.ix_(rows, offsets[valid])] |= grid.matrix[:, valid]
+        patched = YearSummary.__new__(YearSummary)
+        patched.__dict__.update(self.__dict__)
+        patched.subjects, patched.row_of, patched.matrix, patched.key = subjects, row_of, matrix, key
+        grown = len(subjects) - len(self.subjects)
+        patched.cumsum = np.pad(self.cumsum, ((0, grown), (0, 0)))
+        patched.runs = np.pad(self.runs, ((0, grown), (0, 0)))
+        patched._refresh(first)
+        return patched
+
+    def day_index(self, day):
+        return min(max((day - self.start).days, 0), self.matrix.shape[1] - 1)
+
+    def rows(self, subjects):
+        return [self.row_of.get(s, -1) for s in subjects]
+
+    def rate(self, subjects, day, window):
+        # Share of the `window` days ending on `day` that each subject was ticked
+        end = self.day_index(day) + 1
+        begin = max(0, end - window)
+        done = self.cumsum[:, end] - self.cumsum[:, begin]
+        return np.array([done[r] / (end - begin) if r >= 0 else 0.0 for r in self.rows(subjects)])
+
+    def month_totals(self, subjects, month_name):
+        m = list(calendar.month_name).index(month_name) - 1
+        return np.array([self.monthly[r, m] if r >= 0 else 0 for r in self.rows(subjects)], dtype=int)
+
+    def year_longest(self, subjects):
+        return np.array([self.longest[r] if r >= 0 else 0 for r in self.rows(subjects)], dtype=int)
\ No newline at end of file
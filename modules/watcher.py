@@ -0,0 +1,135 @@
+import ctypes
+import ctypes.util
+import glob
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from . import sidecar
+from .data_engine import reload_workbook
+
+# --- WORKBOOK WATCHER ---
+# Notices studyProgress{year}.xlsx being replaced behind the app's back (Excel
+# saving, OneDrive syncing) without anyone clicking. inotify on Linux, a stat
+# poll elsewhere. A burst of writes is debounced into one reload_workbook() per
+# year, which re-imports only the months that changed; `generation` then moves
+# on so every session's live-reload fragment reruns its page once.
+
+WORKBOOK_PATTERN = "studyProgress*.xlsx"
+DEBOUNCE_SECONDS = 1.0
+POLL_SECONDS = 2.0
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")  # struct inotify_event header: wd, mask, cookie, len
+
+def year_of(name):
+    # Not the app's own studyProgressYYYY.tmp.xlsx or Excel's ~$ owner files
+    match = re.fullmatch(r"studyProgress(\d{4})\.xlsx", name)
+    return int(match.group(1)) if match else None
+
+class InotifySource:
+    # Watches the directory, not the files: Excel and os.replace() swap in a new inode
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout=None):
+        # Names touched in the directory, [] once `timeout` seconds pass quietly
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready: return []
+        try: data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError: return []
+        names, offset = [], 0
+        while offset + _EVENT.size <= len(data):
+            _, _, _, length = _EVENT.unpack_from(data, offset)
+            start = offset + _EVENT.size
+            names.append(os.fsdecode(data[start:start + length].rstrip(b"\0")))
+            offset = start + length
+        return names
+
+class PollingSource:
+    def __init__(self, directory, interval=POLL_SECONDS):
+        self.directory = directory
+        self.interval = interval
+        self._stamps = self._scan()
+
+    def _scan(self):
+        return {os.path.basename(p): sidecar.file_stamp(p) for p in glob.glob(os.path.join(self.directory, WORKBOOK_PATTERN))}
+
+    def wait(self, timeout=None):
+        while True:
+            time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+            stamps = self._scan()
+            names = [n for n in stamps.keys() | self._stamps.keys() if stamps.get(n) != self._stamps.get(n)]
+            self._stamps = stamps
+            if names or timeout is not None: return names
+
+def open_source(directory):
+    if sys.platform.startswith("linux"):
+        try: return InotifySource(directory)
+        except (OSError, AttributeError): pass  # inotify limits reached, or no libc symbol
+    return PollingSource(directory)
+
+class WorkbookWatcher:
+    def __init__(self, directory=".", reload=reload_workbook, debounce=DEBOUNCE_SECONDS, source=None):
+        self._reload = reload
+        self.debounce = debounce
+        self.source = source or open_source(directory)
+        self.mode = "inotify" if isinstance(self.source, InotifySource) else "polling"
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.changed = []
+        self.last_reload = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="studyos-watcher", daemon=True)
+        self._thread.start()
+
+    def status(self):
+        with self._lock:
+            return {"mode": self.mode, "generation": self.generation, "changed": list(self.changed),
+                    "last_reload": self.last_reload, "last_error": self.last_error}
+
+    def _collect(self):
+        # Block for the first workbook event, then absorb events until `debounce` seconds pass quietly
+        years = set()
+        while not years: years = {y for y in map(year_of, self.source.wait()) if y}
+        while True:
+            names = self.source.wait(self.debounce)
+            if not names: return years
+            years.update(y for y in map(year_of, names) if y)
+
+    def _run(self):
+        while True:
+            changed = []
+            for year in sorted(self._collect()):
+                try: changed.extend(f"{m} {year}" for m in self._reload(year))
+                except Exception as e:
+                    with self._lock: self.last_error = str(e)  # locked mid-save: the next event retries
+            if not changed: continue
+            with self._lock:
+                self.generation += 1
+                self.changed = changed
+                self.last_reload = datetime.now()
+                self.last_error = None
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def get_watcher():
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None: _watcher = WorkbookWatcher()
+        return _watcher
\ No newline at end of file
@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from . import sidecar
+from .data_engine import compact_journal, list_years
+
+# --- WRITE-BEHIND WORKER ---
+# save_cells() already made each edit durable in the sidecar + journal, so the
+# request path only submits (year, month). This thread waits for a quiet
+# period, coalesces everything submitted meanwhile and compacts each touched
+# workbook once, backing off while Excel/OneDrive holds the file.
+
+DEBOUNCE_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+class WriteBehind:
+    def __init__(self, flush=compact_journal, debounce=DEBOUNCE_SECONDS, max_backoff=MAX_BACKOFF_SECONDS):
+        self._flush = flush
+        self.debounce = debounce
+        self.max_backoff = max_backoff
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.state = "idle"
+        self.retries = 0
+        self.last_flush = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="studyos-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, year, month_name, edits=1):
+        with self._lock:
+            self._idle.clear()
+            self._queue.put((year, month_name, edits))
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def status(self):
+        pending = self.pending()
+        return {
+            "state": self.state,
+            "pending_edits": sum(pending.values()),
+            "pending_months": sorted(f"{m} {y}" for y, m in pending),
+            "retries": self.retries,
+            "last_flush": self.last_flush,
+            "last_error": self.last_error,
+        }
+
+    def flush(self, timeout=None):
+        # Skip the debounce/backoff wait and block until everything reached the workbook
+        self._queue.put(None)
+        return self._idle.wait(timeout)
+
+    def _merge(self, item):
+        if item is None: return True
+        year, month_name, edits = item
+        with self._lock:
+            self._pending[(year, month_name)] = self._pending.get((year, month_name), 0) + edits
+        return False
+
+    def _collect(self, wait):
+        # Keep absorbing submissions until the queue has been quiet for `wait` seconds
+        urgent = False
+        while True:
+            try: item = self._queue.get(timeout=0 if urgent else wait)
+            except queue.Empty: return urgent
+            urgent = self._merge(item) or urgent
+
+    def _run(self):
+        wait, urgent = None, False
+        while True:
+            if wait is None:
+                urgent = self._merge(self._queue.get()) or urgent
+                wait = self.debounce
+            urgent = self._collect(0 if urgent else wait) or urgent
+            with self._lock:
+                years = sorted({y for y, _ in self._pending})
+            self.state = "flushing"
+            failed = False
+            for year in years:
+                try:
+                    ok = self._flush(year, attempts=1)
+                    error = None if ok else "Workbook is locked"
+                except Exception as e:
+                    ok, error = False, str(e)
+                if ok:
+                    with self._lock:
+                        for key in [k for k in self._pending if k[0] == year]: del self._pending[key]
+                else:
+                    failed = True
+                    self.last_error = error
+            if failed:
+                self.retries += 1
+                self.state = "retrying"
+                wait = min(self.max_backoff, 0.5 * 2 ** (self.retries - 1))
+                if urgent: time.sleep(0.5)
+                continue
+            self.state, self.retries, self.last_error = "idle", 0, None
+            self.last_flush = datetime.now()
+            wait, urgent = None, False
+            with self._lock:
+                if not self._pending and self._queue.empty(): self._idle.set()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehind()
+            # Journals left over from a previous run (crash, closed tab) get compacted too
+            for year in list_years():
+                months = {e["month"] for e in sidecar.read_journal(year)}
+                for month_name in months: _writer.submit(year, month_name, 0)
+        return _writer
+
+def shutdown(timeout=15.0):
+    if _writer is None: return True
+    return _writer.flush(timeout)
@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import data_engine, sidecar, sqlite_store
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Workbooks and .studyos/ are relative to the working directory: give each test a fresh one
+    monkeypatch.chdir(tmp_path)
+    data_engine.set_backend("excel")
+    sidecar._manifests.clear()
+    yield tmp_path
+    data_engine.set_backend("excel")
+    sidecar._manifests.clear()
+    # Connections are cached per relative DB path: don't let the next test reuse this directory's database
+    for conn in sqlite_store._local.__dict__.pop("conns", {}).values(): conn.close()
\ No newline at end of file
@@ -0,0 +1,35 @@
+import json
+import cli
+from modules import data_engine
+from modules.config import SUBJECT_COL
+
+LOG = """subject,date,done
+DSA (LeetCode),2024-12-31,
+Physics,2025-01-02,true
+Physics,2025-01-03,0
+,2025-01-04,
+Chem,not-a-date,
+"""
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+def test_import_streams_events_into_month_sheets(workdir, capsys):
+    assert cli.main(["import", write(workdir / "log.csv", LOG), "--batch-size", "2"]) == 0
+    assert "Imported 3 events" in capsys.readouterr().err  # both bad rows reported, not imported
+    jan = data_engine.load_data(2025, "January")
+    # A new month sheet starts from the default subjects, imported subjects are appended
+    assert jan[SUBJECT_COL].tolist()[:4] == data_engine.default_month_frame(2025, "January")[SUBJECT_COL].tolist()
+    row = jan[SUBJECT_COL] == "Physics"
+    assert bool(jan.loc[row, "Date 2025-01-02"].iloc[0]) and not bool(jan.loc[row, "Date 2025-01-03"].iloc[0])
+    assert data_engine.backend().months(2025) == ["January"]
+
+def test_export_round_trips_through_jsonl(workdir):
+    cli.main(["import", write(workdir / "log.csv", LOG)])
+    cli.main(["export", str(workdir / "out.jsonl"), "--years", "2024", "2025"])
+    lines = [json.loads(l) for l in (workdir / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert lines == [{"subject": "DSA (LeetCode)", "date": "2024-12-31"}, {"subject": "Physics", "date": "2025-01-02"}]
+    cli.main(["--backend", "sqlite", "import", str(workdir / "out.jsonl")])
+    cli.main(["--backend", "sqlite", "export", str(workdir / "out.csv")])
+    assert (workdir / "out.csv").read_text(encoding="utf-8").splitlines() == ["subject,date", "DSA (LeetCode),2024-12-31", "Physics,2025-01-02"]
\ No newline at end of file
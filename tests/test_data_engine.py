@@ -0,0 +1,77 @@
+import os
+import threading
+import pandas as pd
+from modules import data_engine, sidecar
+from modules.config import SUBJECT_COL
+
+YEAR = 2025
+DSA = "DSA (LeetCode)"
+
+def cell(df, subject, column):
+    return bool(df.loc[df[SUBJECT_COL] == subject, column].iloc[0])
+
+# --- STALE-EDIT MERGE ---
+def test_save_cells_merges_edit_made_on_stale_version(workdir):
+    data_engine.load_data(YEAR, "March")
+    base = data_engine.month_version(YEAR, "March")
+    assert data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-01", True)], base_version=base) is False
+    # A second session still holds `base`: its edit is merged onto the newer data, not written over it
+    assert data_engine.save_cells(YEAR, "March", [("Aptitude", "Date 2025-03-02", True)], base_version=base) is True
+    df = data_engine.load_data(YEAR, "March")
+    assert cell(df, DSA, "Date 2025-03-01") and cell(df, "Aptitude", "Date 2025-03-02")
+    assert data_engine.month_version(YEAR, "March") == base + 2
+
+# --- JOURNAL COMPACTION ---
+def test_compact_journal_writes_journaled_cells_to_workbook(workdir):
+    data_engine.load_data(YEAR, "March")
+    data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-05", True), (DSA, "Date 2025-03-05", False), (DSA, "Date 2025-03-06", True)])
+    assert len(sidecar.read_journal(YEAR)) == 3
+    raw = pd.read_excel(data_engine.get_file_path(YEAR), sheet_name="March")
+    assert not cell(raw, DSA, "Date 2025-03-06")  # durable in the journal only
+    assert data_engine.compact_journal(YEAR)
+    assert sidecar.read_journal(YEAR) == []
+    raw = pd.read_excel(data_engine.get_file_path(YEAR), sheet_name="March")
+    assert cell(raw, DSA, "Date 2025-03-06") and not cell(raw, DSA, "Date 2025-03-05")  # last write per cell wins
+    assert cell(data_engine.load_data(YEAR, "March"), DSA, "Date 2025-03-06")
+
+# --- COLD LOAD vs. SAVE ---
+def test_cold_load_does_not_hide_a_concurrent_save(workdir, monkeypatch):
+    data_engine.load_data(YEAR, "March")
+    os.utime(data_engine.get_file_path(YEAR), ns=(0, 0))  # the workbook changed: the next load re-imports it
+    data_engine.clear_caches()
+    pending_changes, saver = sidecar.pending_changes, []
+    def pending_then_save(*args):
+        changes = pending_changes(*args)
+        if not saver:
+            # Another session ticks a cell after this load read the journal, before it writes the sidecar
+            saver.append(threading.Thread(target=data_engine.save_cells, args=(YEAR, "March", [(DSA, "Date 2025-03-04", True)])))
+            saver[0].start()
+            saver[0].join(0.5)
+        return changes
+    monkeypatch.setattr(sidecar, "pending_changes", pending_then_save)
+    data_engine.load_data(YEAR, "March")
+    saver[0].join()
+    assert cell(data_engine.load_data(YEAR, "March"), DSA, "Date 2025-03-04")
+    data_engine.clear_caches()
+    assert cell(data_engine.load_data(YEAR, "March"), DSA, "Date 2025-03-04")
+    assert data_engine.compact_journal(YEAR)
+    assert cell(pd.read_excel(data_engine.get_file_path(YEAR), sheet_name="March"), DSA, "Date 2025-03-04")
+
+# --- JOURNALED SUBJECT ADD ---
+def test_add_subject_is_journaled_instead_of_rewriting_the_sheet(workdir):
+    data_engine.load_data(YEAR, "March")
+    filename = data_engine.get_file_path(YEAR)
+    stamp = sidecar.file_stamp(filename)
+    assert data_engine.add_subject(YEAR, "March", "Physics", rating=2) is True
+    assert data_engine.add_subject(YEAR, "March", "Physics") is False
+    assert sidecar.file_stamp(filename) == stamp  # workbook untouched until compaction
+    data_engine.save_cells(YEAR, "March", [("Physics", "Date 2025-03-03", True)])
+    df = data_engine.load_data(YEAR, "March")
+    assert df[SUBJECT_COL].tolist()[-1] == "Physics" and cell(df, "Physics", "Date 2025-03-03")
+    assert data_engine.compact_journal(YEAR)
+    raw = pd.read_excel(filename, sheet_name="March")
+    assert raw[SUBJECT_COL].tolist()[-1] == "Physics" and raw.loc[raw[SUBJECT_COL] == "Physics", "Excellence Rating"].iloc[0] == 2
+    assert cell(raw, "Physics", "Date 2025-03-03") and not raw.loc[raw[SUBJECT_COL] == "Physics", "Date 2025-03-04"].any()
+    data_engine.clear_caches()
+    os.utime(filename, ns=(0, 0))  # force a re-import from the workbook
+    assert cell(data_engine.load_data(YEAR, "March"), "Physics", "Date 2025-03-03")
\ No newline at end of file
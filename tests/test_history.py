@@ -0,0 +1,29 @@
+from datetime import date
+import numpy as np
+from modules import data_engine
+from modules.history import HistoryIndex
+
+DSA = "DSA (LeetCode)"
+
+def tick(day, subject=DSA):
+    data_engine.save_cells(day.year, day.strftime("%B"), [(subject, f"Date {day:%Y-%m-%d}", True)])
+
+def test_history_counts_span_years(workdir):
+    for day in [date(2024, 12, 31), date(2025, 1, 1)]: tick(day)
+    tick(date(2025, 1, 1), "Aptitude")
+    counts = data_engine.get_history_counts("2024-12-30", "2025-01-02")
+    assert counts.tolist() == [0, 1, 2, 0]
+    assert str(counts.index[0].date()) == "2024-12-30"
+    assert data_engine.get_history_counts("2024-12-30", "2025-01-02", subjects=["Aptitude"]).tolist() == [0, 0, 1, 0]
+
+def test_history_activity_by_subject(workdir):
+    tick(date(2025, 3, 2))
+    activity = data_engine.get_history("2025-03-01", "2025-03-03", subjects=[DSA, "Unknown"])
+    assert activity[DSA].tolist() == [False, True, False]
+    assert not activity["Unknown"].any()
+
+def test_history_ranges_outside_the_index_are_empty():
+    index = HistoryIndex(date(2025, 1, 1), ["A"], np.ones((1, 365), dtype=bool))
+    assert index.daily_counts("2024-12-30", "2025-01-02").tolist() == [0, 0, 1, 1]
+    assert index.daily_counts("2026-01-01", "2026-01-03").tolist() == [0, 0, 0]
+    assert index.until(date(2026, 1, 2)).matrix.shape == (1, 367)  # padded past the last year
\ No newline at end of file
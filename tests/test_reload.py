@@ -0,0 +1,51 @@
+import os
+from openpyxl import load_workbook
+from modules import data_engine
+from modules.config import SUBJECT_COL
+
+YEAR = 2025
+DSA = "DSA (LeetCode)"
+
+def cell(df, subject, column):
+    return bool(df.loc[df[SUBJECT_COL] == subject, column].iloc[0])
+
+def edit_outside(month_name, row, column, value, header=None):
+    # What Excel / OneDrive do: a new file swapped in over the workbook
+    filename = data_engine.get_file_path(YEAR)
+    wb = load_workbook(filename)
+    ws = wb[month_name]
+    ws.cell(row=row, column=column, value=value)
+    if header: ws.cell(row=1, column=ws.max_column + 1, value=header)
+    wb.save("outside.xlsx")
+    os.replace("outside.xlsx", filename)
+
+# --- EXTERNAL RELOAD ---
+def test_reload_workbook_reimports_only_changed_months(workdir):
+    for month_name in ["March", "April"]: data_engine.load_data(YEAR, month_name)
+    version = data_engine.month_version(YEAR, "April")
+    assert data_engine.reload_workbook(YEAR) == []  # nothing changed outside the app
+    edit_outside("March", row=2, column=4, value=True)
+    assert data_engine.reload_workbook(YEAR) == ["March"]
+    stamp, _ = data_engine._cache[("frame", YEAR, "April")]
+    assert stamp == data_engine.backend().stamp(YEAR)  # still served, not re-read
+    assert ("frame", YEAR, "March") not in data_engine._cache
+    assert data_engine.month_version(YEAR, "April") == version
+    assert cell(data_engine.load_data(YEAR, "March"), DSA, "Date 2025-03-01")
+    assert data_engine.reload_workbook(YEAR) == []
+
+def test_reload_workbook_drops_sidecar_it_cannot_store(workdir):
+    data_engine.load_data(YEAR, "March")
+    edit_outside("March", row=2, column=4, value=True, header="Notes")
+    assert data_engine.reload_workbook(YEAR) == ["March"]
+    df = data_engine.load_data(YEAR, "March")
+    assert "Notes" in df.columns and cell(df, DSA, "Date 2025-03-01")
+
+def test_reload_workbook_patches_year_summary(workdir):
+    data_engine.load_data(YEAR, "March")
+    before = data_engine.get_year_summary(YEAR)
+    edit_outside("March", row=2, column=4, value=True)
+    data_engine.reload_workbook(YEAR)
+    patched = data_engine._summaries[YEAR]
+    assert patched is not before and patched.key == data_engine.backend().data_stamp(YEAR)
+    assert data_engine.get_year_summary(YEAR) is patched  # no rebuild
+    assert patched.month_totals([DSA], "March").tolist() == [1]
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pandas as pd
+from modules import data_engine, sqlite_store
+from modules.config import SUBJECT_COL, RATING_COL, STATUS_COL
+
+YEAR = 2025
+DSA = "DSA (LeetCode)"
+
+def cell(df, subject, column):
+    return df.loc[df[SUBJECT_COL] == subject, column].iloc[0]
+
+def test_update_cells_upserts_ticks_and_flags_stale_base(workdir):
+    data_engine.set_backend("sqlite")
+    data_engine.load_events(YEAR, "March")  # seeds the default subjects
+    base = data_engine.month_version(YEAR, "March")
+    assert data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-01", True), (DSA, RATING_COL, 4)], base_version=base) is False
+    changes = [("Aptitude", "Date 2025-03-02", True), ("Aptitude", STATUS_COL, "Completed"), ("Nobody", "Date 2025-03-02", True)]
+    assert data_engine.save_cells(YEAR, "March", changes, base_version=base) is True
+    assert data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-01", False)]) is False
+    df = data_engine.load_data(YEAR, "March")
+    assert not cell(df, DSA, "Date 2025-03-01") and cell(df, "Aptitude", "Date 2025-03-02")
+    assert cell(df, DSA, RATING_COL) == 4 and cell(df, "Aptitude", STATUS_COL) == "Completed"
+    assert "Nobody" not in set(df[SUBJECT_COL])
+    assert sqlite_store.connect().execute("SELECT COUNT(*) FROM ticks WHERE done = 1").fetchone()[0] == 1
+
+def test_add_subject_appends_once(workdir):
+    data_engine.set_backend("sqlite")
+    assert data_engine.add_subject(YEAR, "March", "Physics") is True
+    assert data_engine.add_subject(YEAR, "March", "Physics") is False
+    assert data_engine.load_data(YEAR, "March")[SUBJECT_COL].tolist()[-1] == "Physics"
+
+def test_transfer_round_trips_between_backends(workdir):
+    data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-01", True)])
+    data_engine.save_cells(YEAR, "April", [("Aptitude", "Date 2025-04-30", True), ("Aptitude", RATING_COL, 3)])
+    excel = {m: data_engine.load_data(YEAR, m) for m in ["March", "April"]}
+    assert data_engine.transfer("excel", "sqlite") == [YEAR]
+    data_engine.set_backend("sqlite")
+    assert sqlite_store.months(YEAR) == ["March", "April"]
+    for month_name, df in excel.items(): pd.testing.assert_frame_equal(data_engine.load_data(YEAR, month_name), df, check_dtype=False)
+    data_engine.save_cells(YEAR, "March", [(DSA, "Date 2025-03-02", True)])
+    assert data_engine.transfer("sqlite", "excel") == [YEAR]
+    data_engine.set_backend("excel")
+    assert cell(data_engine.load_data(YEAR, "March"), DSA, "Date 2025-03-02")
\ No newline at end of file
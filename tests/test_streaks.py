@@ -0,0 +1,27 @@
+from datetime import date
+import numpy as np
+from modules import data_engine
+from modules.streaks import run_lengths
+
+DSA = "DSA (LeetCode)"
+
+def tick(day, subject=DSA):
+    data_engine.save_cells(day.year, day.strftime("%B"), [(subject, f"Date {day:%Y-%m-%d}", True)])
+
+def test_run_lengths_counts_streak_ending_on_each_day():
+    assert run_lengths([1, 1, 0, 1, 1, 1, 0]).tolist() == [1, 2, 0, 1, 2, 3, 0]
+    assert run_lengths(np.array([[1, 1], [0, 1]])).tolist() == [[1, 2], [0, 1]]
+
+def test_streak_runs_across_month_and_year_boundaries(workdir):
+    for day in [date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 1), date(2025, 1, 2)]: tick(day)
+    report = data_engine.get_streak_report(date(2025, 1, 2))
+    assert report.current == 4 and report.longest == 4 and report.subjects[DSA] == (4, 4)
+    assert data_engine.get_streak_report(date(2025, 1, 3)).current == 4  # today not ticked yet
+    assert data_engine.get_streak_report(date(2025, 1, 4)).current == 0
+
+def test_streak_counts_any_subject_and_per_subject_separately(workdir):
+    tick(date(2025, 1, 31))
+    tick(date(2025, 2, 1), "Aptitude")
+    report = data_engine.get_streak_report(date(2025, 2, 1))
+    assert report.current == 2
+    assert report.subjects[DSA] == (1, 1) and report.subjects["Aptitude"] == (1, 1)
\ No newline at end of file
@@ -0,0 +1,43 @@
+import calendar
+import numpy as np
+from modules.events import month_dates
+from modules.grid import MonthGrid
+from modules.summary import YearSummary
+
+FIELDS = ["cumsum", "runs", "totals", "monthly", "longest"]
+
+def assert_same(patched, rebuilt):
+    assert patched.subjects == rebuilt.subjects
+    for field in FIELDS: np.testing.assert_array_equal(getattr(patched, field), getattr(rebuilt, field), err_msg=field)
+
+def patch(year, subjects, matrix, month_name, grid):
+    # Expected result: the month's columns replaced in the raw matrix, then a full rebuild
+    m = list(calendar.month_name).index(month_name)
+    first = (np.datetime64(f"{year}-{m:02d}-01") - np.datetime64(f"{year}-01-01")).astype(int)
+    names = subjects + [s for s in grid.subjects if s not in subjects]
+    full = np.zeros((len(names), matrix.shape[1]), dtype=bool)
+    full[:len(subjects)] = matrix
+    full[:, first:first + len(grid.dates)] = False
+    for i, s in enumerate(grid.subjects): full[names.index(s), first:first + len(grid.dates)] = grid.matrix[i]
+    return YearSummary(year, names, full)
+
+def test_with_month_matches_full_rebuild():
+    rng = np.random.default_rng(0)
+    year, subjects = 2024, ["A", "B", "C"]
+    matrix = rng.random((3, 366)) < 0.6
+    summary = YearSummary(year, subjects, matrix)
+    for month_name in ["January", "February", "July", "December"]:
+        dates = month_dates(year, month_name)
+        grid = MonthGrid.from_matrix(["C", "A"], dates, rng.random((2, len(dates))) < 0.5)
+        assert_same(summary.with_month(month_name, grid), patch(year, subjects, matrix, month_name, grid))
+
+def test_with_month_adds_new_subject_and_leaves_original_untouched():
+    year, subjects = 2025, ["A"]
+    matrix = np.ones((1, 365), dtype=bool)
+    summary = YearSummary(year, subjects, matrix)
+    dates = month_dates(year, "March")
+    grid = MonthGrid.from_matrix(["A", "New"], dates, np.array([[False] * len(dates), [True] * len(dates)]))
+    patched = summary.with_month("March", grid)
+    assert_same(patched, patch(year, subjects, matrix, "March", grid))
+    assert summary.subjects == ["A"] and summary.totals.tolist() == [365]
+    assert patched.year_longest(["A", "New"]).tolist() == [365 - 31 - 59, 31]
\ No newline at end of file